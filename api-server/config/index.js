@@ -43,6 +43,10 @@ module.exports = {
     maxRequests: parseInt(process.env.RATE_LIMIT_MAX_REQUESTS) || 100
   },
   
+  batch: {
+    maxSize: parseInt(process.env.BATCH_MAX_SIZE) || 1000
+  },
+  
   logging: {
     level: process.env.LOG_LEVEL || 'info'
   },
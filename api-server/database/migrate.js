@@ -140,7 +140,10 @@ const createTables = async () => {
     // Create indexes
     await client.query('CREATE INDEX IF NOT EXISTS idx_accounts_customer ON accounts(customer_id)');
     await client.query('CREATE INDEX IF NOT EXISTS idx_transactions_account ON transactions(account_id)');
+    await client.query('CREATE INDEX IF NOT EXISTS idx_transactions_account_date ON transactions(account_id, transaction_date, id)');
     await client.query('CREATE INDEX IF NOT EXISTS idx_payments_source ON payments(source_account_id)');
+    await client.query('CREATE INDEX IF NOT EXISTS idx_payments_created ON payments(created_at, id)');
+    await client.query('CREATE UNIQUE INDEX IF NOT EXISTS idx_payments_idempotency_key ON payments(idempotency_key)');
     await client.query('CREATE INDEX IF NOT EXISTS idx_oauth_tokens_access ON oauth_tokens(access_token)');
     
     await client.query('COMMIT');
@@ -5,6 +5,7 @@
 const express = require('express');
 const cors = require('cors');
 const helmet = require('helmet');
+const compression = require('compression');
 const config = require('../config');
 const logger = require('./utils/logger');
 const errorHandler = require('./middleware/errorHandler');
@@ -22,8 +23,11 @@ const app = express();
 app.use(helmet());
 app.use(cors());
 
-// Body parsing
-app.use(express.json());
+// Response compression (gzip/brotli, negotiated via Accept-Encoding)
+app.use(compression({ threshold: 1024 }));
+
+// Body parsing (gzip/deflate request bodies are inflated automatically)
+app.use(express.json({ limit: '10mb' }));
 app.use(express.urlencoded({ extended: true }));
 
 // Rate limiting
@@ -4,8 +4,17 @@
 
 const express = require('express');
 const router = express.Router();
+const config = require('../../config');
 const accountsService = require('../services/accountsService');
 const { authenticateToken, checkScopes } = require('../middleware/auth');
+const { body, query, validationResult } = require('express-validator');
+
+const validateAccountIds = [
+  body('ids')
+    .isArray({ min: 1, max: config.batch.maxSize })
+    .withMessage(`ids must be an array of 1 to ${config.batch.maxSize} account IDs`),
+  body('ids.*').isUUID().withMessage('Each account ID must be a UUID')
+];
 
 // GET /api/v1/accounts - List accounts
 router.get('/', authenticateToken, checkScopes(['accounts.read']), async (req, res, next) => {
@@ -13,7 +22,8 @@ router.get('/', authenticateToken, checkScopes(['accounts.read']), async (req, r
     const filters = {
       limit: parseInt(req.query.limit) || 10,
       offset: parseInt(req.query.offset) || 0,
-      customerId: req.query.customerId
+      customerId: req.query.customerId,
+      fields: req.query.fields
     };
     
     const result = await accountsService.listAccounts(filters);
@@ -23,6 +33,36 @@ router.get('/', authenticateToken, checkScopes(['accounts.read']), async (req, r
   }
 });
 
+// POST /api/v1/accounts/batch - Get details for multiple accounts
+router.post('/batch', authenticateToken, checkScopes(['accounts.read']), validateAccountIds, async (req, res, next) => {
+  try {
+    const errors = validationResult(req);
+    if (!errors.isEmpty()) {
+      return res.status(400).json({ errors: errors.array() });
+    }
+    
+    const result = await accountsService.getAccounts(req.body.ids);
+    res.json(result);
+  } catch (error) {
+    next(error);
+  }
+});
+
+// POST /api/v1/accounts/batch/balances - Get balances for multiple accounts
+router.post('/batch/balances', authenticateToken, checkScopes(['accounts.read']), validateAccountIds, async (req, res, next) => {
+  try {
+    const errors = validationResult(req);
+    if (!errors.isEmpty()) {
+      return res.status(400).json({ errors: errors.array() });
+    }
+    
+    const result = await accountsService.getBalances(req.body.ids);
+    res.json(result);
+  } catch (error) {
+    next(error);
+  }
+});
+
 // GET /api/v1/accounts/:id - Get account details
 router.get('/:id', authenticateToken, checkScopes(['accounts.read']), async (req, res, next) => {
   try {
@@ -50,16 +90,30 @@ router.get('/:id/balance', authenticateToken, checkScopes(['accounts.read']), as
 });
 
 // GET /api/v1/accounts/:id/transactions - Get account transactions
-router.get('/:id/transactions', authenticateToken, checkScopes(['transactions.read']), async (req, res, next) => {
+router.get('/:id/transactions', authenticateToken, checkScopes(['transactions.read']), [
+  query('fromDate').optional().isISO8601().withMessage('fromDate must be a date (YYYY-MM-DD)'),
+  query('toDate').optional().isISO8601().withMessage('toDate must be a date (YYYY-MM-DD)')
+], async (req, res, next) => {
   try {
+    const errors = validationResult(req);
+    if (!errors.isEmpty()) {
+      return res.status(400).json({ errors: errors.array() });
+    }
+    
     const filters = {
       fromDate: req.query.fromDate,
       toDate: req.query.toDate,
       type: req.query.type,
-      limit: parseInt(req.query.limit) || 10
+      limit: parseInt(req.query.limit) || 10,
+      offset: parseInt(req.query.offset) || 0,
+      cursor: req.query.cursor,
+      fields: req.query.fields
     };
     
     const transactions = await accountsService.getTransactions(req.params.id, filters);
+    if (transactions.nextCursor) {
+      res.set('X-Next-Cursor', transactions.nextCursor);
+    }
     res.json(transactions);
   } catch (error) {
     next(error);
@@ -4,9 +4,10 @@
 
 const express = require('express');
 const router = express.Router();
+const config = require('../../config');
 const paymentsService = require('../services/paymentsService');
 const { authenticateToken, checkScopes } = require('../middleware/auth');
-const { body, validationResult } = require('express-validator');
+const { body, query, validationResult } = require('express-validator');
 
 // POST /api/v1/payments - Initiate payment
 router.post('/',
@@ -46,6 +47,41 @@ router.post('/',
   }
 );
 
+// POST /api/v1/payments/bulk - Initiate multiple payments
+router.post('/bulk',
+  authenticateToken,
+  checkScopes(['payments.write']),
+  [
+    body('payments')
+      .isArray({ min: 1, max: config.batch.maxSize })
+      .withMessage(`payments must be an array of 1 to ${config.batch.maxSize} items`)
+  ],
+  async (req, res, next) => {
+    try {
+      const errors = validationResult(req);
+      if (!errors.isEmpty()) {
+        return res.status(400).json({ errors: errors.array() });
+      }
+      
+      // Items are validated one by one in the service, so a bad item only fails itself
+      const items = req.body.payments.map(payment => (payment && typeof payment === 'object' ? {
+        sourceAccountId: payment.sourceAccountId,
+        destinationAccountNumber: payment.destinationAccountNumber,
+        amount: typeof payment.amount === 'string' ? Number(payment.amount) : payment.amount,
+        currency: payment.currency || 'KES',
+        reference: payment.reference,
+        description: payment.description,
+        idempotencyKey: payment.idempotencyKey
+      } : payment));
+      
+      const result = await paymentsService.initiatePayments(items);
+      res.json(result);
+    } catch (error) {
+      next(error);
+    }
+  }
+);
+
 // GET /api/v1/payments/:id - Get payment details
 router.get('/:id', authenticateToken, checkScopes(['payments.read', 'payments.write']), async (req, res, next) => {
   try {
@@ -73,15 +109,31 @@ router.get('/:id/status', authenticateToken, checkScopes(['payments.read', 'paym
 });
 
 // GET /api/v1/payments - List payments
-router.get('/', authenticateToken, checkScopes(['payments.read', 'payments.write']), async (req, res, next) => {
+router.get('/', authenticateToken, checkScopes(['payments.read', 'payments.write']), [
+  query('fromDate').optional().isISO8601().withMessage('fromDate must be a date (YYYY-MM-DD)'),
+  query('toDate').optional().isISO8601().withMessage('toDate must be a date (YYYY-MM-DD)')
+], async (req, res, next) => {
   try {
+    const errors = validationResult(req);
+    if (!errors.isEmpty()) {
+      return res.status(400).json({ errors: errors.array() });
+    }
+    
     const filters = {
       sourceAccountId: req.query.sourceAccountId,
       status: req.query.status,
-      limit: parseInt(req.query.limit) || 10
+      fromDate: req.query.fromDate,
+      toDate: req.query.toDate,
+      limit: parseInt(req.query.limit) || 10,
+      offset: parseInt(req.query.offset) || 0,
+      cursor: req.query.cursor,
+      fields: req.query.fields
     };
     
     const payments = await paymentsService.listPayments(filters);
+    if (payments.nextCursor) {
+      res.set('X-Next-Cursor', payments.nextCursor);
+    }
     res.json(payments);
   } catch (error) {
     next(error);
@@ -4,12 +4,42 @@
 
 const pool = require('../../database/pool');
 const logger = require('../utils/logger');
+const { parseFields, selectColumns, pickFields } = require('../utils/fields');
+const { decodeCursor, nextCursor } = require('../utils/cursor');
+
+// Columns needed to build each field of a listed account
+const ACCOUNT_COLUMNS = {
+  id: ['a.id'],
+  accountNumber: ['a.account_number'],
+  accountType: ['a.account_type'],
+  currency: ['a.currency'],
+  balance: ['a.balance'],
+  availableBalance: ['a.available_balance'],
+  status: ['a.status'],
+  customer: ['c.first_name', 'c.last_name', 'c.email'],
+  createdAt: ['a.created_at']
+};
+
+// Columns needed to build each field of a transaction
+const TRANSACTION_COLUMNS = {
+  id: ['id'],
+  transactionRef: ['transaction_ref'],
+  type: ['transaction_type'],
+  amount: ['amount'],
+  currency: ['currency'],
+  balanceAfter: ['balance_after'],
+  description: ['description'],
+  status: ['status'],
+  transactionDate: ['transaction_date'],
+  createdAt: ['created_at']
+};
 
 class AccountsService {
   async listAccounts(filters = {}) {
     try {
+      const fields = parseFields(filters.fields, ACCOUNT_COLUMNS);
       let query = `
-        SELECT a.*, c.first_name, c.last_name, c.email
+        SELECT ${selectColumns(fields, ACCOUNT_COLUMNS) || 'a.*, c.first_name, c.last_name, c.email'}
         FROM accounts a
         JOIN customers c ON a.customer_id = c.id
         WHERE a.status = 'active'
@@ -37,7 +67,7 @@ class AccountsService {
       const result = await pool.query(query, params);
       
       return {
-        data: result.rows.map(row => ({
+        data: result.rows.map(row => pickFields({
           id: row.id,
           accountNumber: row.account_number,
           accountType: row.account_type,
@@ -51,7 +81,7 @@ class AccountsService {
             email: row.email
           },
           createdAt: row.created_at
-        })),
+        }, fields)),
         pagination: {
           limit: filters.limit || 10,
           offset: filters.offset || 0
@@ -76,29 +106,29 @@ class AccountsService {
         throw new Error('Account not found');
       }
       
-      return {
-        id: result.id,
-        accountNumber: result.account_number,
-        accountType: result.account_type,
-        currency: result.currency,
-        balance: parseFloat(result.balance),
-        availableBalance: parseFloat(result.available_balance),
-        status: result.status,
-        customer: {
-          firstName: result.first_name,
-          lastName: result.last_name,
-          email: result.email,
-          phone: result.phone
-        },
-        createdAt: result.created_at,
-        updatedAt: result.updated_at
-      };
+      return this._formatAccount(result);
     } catch (error) {
       logger.error('Get account error:', error);
       throw error;
     }
   }
 
+  async getAccounts(accountIds) {
+    try {
+      const result = await pool.query(`
+        SELECT a.*, c.first_name, c.last_name, c.email, c.phone
+        FROM accounts a
+        JOIN customers c ON a.customer_id = c.id
+        WHERE a.id = ANY($1::uuid[])
+      `, [accountIds]);
+      
+      return this._inRequestOrder(accountIds, result.rows, row => this._formatAccount(row));
+    } catch (error) {
+      logger.error('Get accounts error:', error);
+      throw error;
+    }
+  }
+
   async getBalance(accountId) {
     try {
       const result = await pool.query_one(`
@@ -122,10 +152,33 @@ class AccountsService {
     }
   }
 
+  async getBalances(accountIds) {
+    try {
+      const result = await pool.query(`
+        SELECT id, balance, available_balance, currency
+        FROM accounts
+        WHERE id = ANY($1::uuid[])
+      `, [accountIds]);
+      
+      return this._inRequestOrder(accountIds, result.rows, row => ({
+        accountId: row.id,
+        balance: parseFloat(row.balance),
+        available: parseFloat(row.available_balance),
+        currency: row.currency
+      }));
+    } catch (error) {
+      logger.error('Get balances error:', error);
+      throw error;
+    }
+  }
+
   async getTransactions(accountId, filters = {}) {
     try {
+      const fields = parseFields(filters.fields, TRANSACTION_COLUMNS);
+      const cursor = decodeCursor(filters.cursor);
       let query = `
-        SELECT *
+        SELECT ${selectColumns(fields, TRANSACTION_COLUMNS) || '*'},
+               transaction_date::text AS cursor_key, id AS cursor_id
         FROM transactions
         WHERE account_id = $1
       `;
@@ -134,12 +187,13 @@ class AccountsService {
       
       if (filters.fromDate) {
         params.push(filters.fromDate);
-        query += ` AND transaction_date >= $${params.length}`;
+        query += ` AND transaction_date >= $${params.length}::date`;
       }
       
       if (filters.toDate) {
         params.push(filters.toDate);
-        query += ` AND transaction_date <= $${params.length}`;
+        // toDate is inclusive: everything before the start of the next day
+        query += ` AND transaction_date < $${params.length}::date + INTERVAL '1 day'`;
       }
       
       if (filters.type) {
@@ -147,17 +201,27 @@ class AccountsService {
         query += ` AND transaction_type = $${params.length}`;
       }
       
-      query += ' ORDER BY transaction_date DESC';
+      if (cursor) {
+        params.push(cursor.sortKey, cursor.id);
+        query += ` AND (transaction_date, id) < ($${params.length - 1}::timestamp, $${params.length}::uuid)`;
+      }
+      
+      query += ' ORDER BY transaction_date DESC, id DESC';
       
       if (filters.limit) {
         params.push(filters.limit);
         query += ` LIMIT $${params.length}`;
       }
       
+      if (filters.offset) {
+        params.push(filters.offset);
+        query += ` OFFSET $${params.length}`;
+      }
+      
       const result = await pool.query(query, params);
       
       return {
-        data: result.rows.map(row => ({
+        data: result.rows.map(row => pickFields({
           id: row.id,
           transactionRef: row.transaction_ref,
           type: row.transaction_type,
@@ -168,13 +232,52 @@ class AccountsService {
           status: row.status,
           transactionDate: row.transaction_date,
           createdAt: row.created_at
-        }))
+        }, fields)),
+        nextCursor: nextCursor(result.rows, filters.limit)
       };
     } catch (error) {
       logger.error('Get transactions error:', error);
       throw error;
     }
   }
+
+  _formatAccount(row) {
+    return {
+      id: row.id,
+      accountNumber: row.account_number,
+      accountType: row.account_type,
+      currency: row.currency,
+      balance: parseFloat(row.balance),
+      availableBalance: parseFloat(row.available_balance),
+      status: row.status,
+      customer: {
+        firstName: row.first_name,
+        lastName: row.last_name,
+        email: row.email,
+        phone: row.phone
+      },
+      createdAt: row.created_at,
+      updatedAt: row.updated_at
+    };
+  }
+
+  // Return formatted rows in the order the IDs were requested, plus IDs that matched nothing
+  _inRequestOrder(accountIds, rows, format) {
+    const byId = new Map(rows.map(row => [String(row.id).toLowerCase(), row]));
+    const data = [];
+    const notFound = [];
+    
+    accountIds.forEach(id => {
+      const row = byId.get(String(id).toLowerCase());
+      if (row) {
+        data.push(format(row));
+      } else {
+        notFound.push(id);
+      }
+    });
+    
+    return { data, notFound };
+  }
 }
 
 module.exports = new AccountsService();
@@ -5,6 +5,50 @@
 const pool = require('../../database/pool');
 const logger = require('../utils/logger');
 const crypto = require('crypto');
+const { parseFields, selectColumns, pickFields } = require('../utils/fields');
+const { decodeCursor, nextCursor } = require('../utils/cursor');
+
+// Columns needed to build each field of a payment
+const PAYMENT_COLUMNS = {
+  id: ['id'],
+  paymentRef: ['payment_ref'],
+  sourceAccountId: ['source_account_id'],
+  destinationAccountNumber: ['destination_account_number'],
+  amount: ['amount'],
+  currency: ['currency'],
+  reference: ['reference'],
+  description: ['description'],
+  status: ['status'],
+  riskScore: ['risk_score'],
+  idempotencyKey: ['idempotency_key'],
+  completedAt: ['completed_at'],
+  createdAt: ['created_at']
+};
+
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+// Check one bulk payment item; returns the reason it is invalid, or null
+const validateBulkItem = (item) => {
+  if (!item || typeof item !== 'object' || Array.isArray(item)) {
+    return 'Payment must be an object';
+  }
+  if (typeof item.sourceAccountId !== 'string' || !UUID_PATTERN.test(item.sourceAccountId)) {
+    return 'Source account ID must be a UUID';
+  }
+  if (!item.destinationAccountNumber) {
+    return 'Destination account number is required';
+  }
+  if (!Number.isFinite(item.amount) || item.amount <= 0) {
+    return 'Amount must be greater than 0';
+  }
+  if (typeof item.currency !== 'string' || item.currency.length !== 3) {
+    return 'Currency must be 3 characters';
+  }
+  if (item.idempotencyKey != null && (typeof item.idempotencyKey !== 'string' || item.idempotencyKey.length > 255)) {
+    return 'Idempotency key must be at most 255 characters';
+  }
+  return null;
+};
 
 class PaymentsService {
   async initiatePayment(paymentData) {
@@ -112,6 +156,190 @@ class PaymentsService {
     }
   }
 
+  async initiatePayments(items) {
+    const client = await pool.connect();
+    
+    try {
+      await client.query('BEGIN');
+      
+      const results = new Array(items.length);
+      
+      // Invalid items fail on their own instead of rejecting the whole batch
+      const invalid = items.map(validateBulkItem);
+      const valid = items.filter((item, index) => !invalid[index]);
+      
+      // Lock every source account once, in id order so concurrent batches cannot deadlock
+      const accountIds = [...new Set(valid.map(item => item.sourceAccountId.toLowerCase()))];
+      const accounts = await client.query(`
+        SELECT id, available_balance FROM accounts
+        WHERE id = ANY($1::uuid[]) AND status = 'active'
+        ORDER BY id
+        FOR UPDATE
+      `, [accountIds]);
+      
+      // Replay payments whose idempotency keys have been used before; looked up
+      // after the lock so a concurrent batch on the same accounts has committed
+      const keys = [...new Set(valid.map(item => item.idempotencyKey).filter(Boolean))];
+      const existing = new Map();
+      
+      if (keys.length) {
+        const found = await client.query(`
+          SELECT * FROM payments WHERE idempotency_key = ANY($1::text[])
+        `, [keys]);
+        found.rows.forEach(payment => existing.set(payment.idempotency_key, payment));
+      }
+      
+      const available = new Map(accounts.rows.map(row => [String(row.id).toLowerCase(), parseFloat(row.available_balance)]));
+      
+      const accepted = [];
+      const acceptedKeys = new Map();
+      const debits = new Map();
+      
+      items.forEach((item, index) => {
+        const key = (item && item.idempotencyKey) || null;
+        const result = { index, idempotencyKey: key };
+        results[index] = result;
+        
+        if (invalid[index]) {
+          result.status = 'failed';
+          result.error = invalid[index];
+          return;
+        }
+        
+        if (key && existing.has(key)) {
+          result.status = 'duplicate';
+          result.payment = this._formatPayment(existing.get(key));
+          return;
+        }
+        
+        if (key && acceptedKeys.has(key)) {
+          result.status = 'duplicate';
+          result.duplicateOf = acceptedKeys.get(key);
+          return;
+        }
+        
+        const accountId = String(item.sourceAccountId).toLowerCase();
+        
+        if (!available.has(accountId)) {
+          result.status = 'failed';
+          result.error = 'Source account not found or inactive';
+          return;
+        }
+        
+        if (available.get(accountId) < item.amount) {
+          result.status = 'failed';
+          result.error = 'Insufficient funds';
+          return;
+        }
+        
+        available.set(accountId, available.get(accountId) - item.amount);
+        debits.set(accountId, (debits.get(accountId) || 0) + item.amount);
+        
+        if (key) {
+          acceptedKeys.set(key, index);
+        }
+        
+        // Same risk scoring as single payments
+        const amountRisk = item.amount > 100000 ? 0.3 : 0.1;
+        
+        // Wider random suffix than single payments since a batch shares one timestamp
+        accepted.push({
+          index,
+          item,
+          accountId,
+          paymentRef: `PAY${Date.now()}${crypto.randomBytes(6).toString('hex').toUpperCase()}`,
+          riskScore: Math.min(amountRisk + Math.random() * 0.2, 0.99)
+        });
+      });
+      
+      if (accepted.length) {
+        const inserted = await client.query(`
+          INSERT INTO payments (
+            payment_ref, source_account_id, destination_account_number,
+            amount, currency, reference, description, status, risk_score,
+            idempotency_key, completed_at
+          )
+          SELECT p.payment_ref, p.source_account_id, p.destination_account_number,
+                 p.amount, p.currency, p.reference, p.description, 'completed', p.risk_score,
+                 p.idempotency_key, CURRENT_TIMESTAMP
+          FROM unnest(
+            $1::text[], $2::uuid[], $3::text[], $4::numeric[], $5::text[],
+            $6::text[], $7::text[], $8::numeric[], $9::text[]
+          ) AS p(
+            payment_ref, source_account_id, destination_account_number, amount, currency,
+            reference, description, risk_score, idempotency_key
+          )
+          RETURNING *
+        `, [
+          accepted.map(p => p.paymentRef),
+          accepted.map(p => p.accountId),
+          accepted.map(p => p.item.destinationAccountNumber),
+          accepted.map(p => p.item.amount),
+          accepted.map(p => p.item.currency || 'KES'),
+          accepted.map(p => p.item.reference || null),
+          accepted.map(p => p.item.description || null),
+          accepted.map(p => p.riskScore),
+          accepted.map(p => p.item.idempotencyKey || null)
+        ]);
+        
+        // Debit each source account once with its batch total
+        await client.query(`
+          UPDATE accounts a
+          SET available_balance = a.available_balance - d.total,
+              updated_at = CURRENT_TIMESTAMP
+          FROM unnest($1::uuid[], $2::numeric[]) AS d(id, total)
+          WHERE a.id = d.id
+        `, [[...debits.keys()], [...debits.values()]]);
+        
+        // Create debit transactions
+        await client.query(`
+          INSERT INTO transactions (
+            transaction_ref, account_id, transaction_type, amount, description, status
+          )
+          SELECT t.transaction_ref, t.account_id, 'debit', t.amount, t.description, 'completed'
+          FROM unnest($1::text[], $2::uuid[], $3::numeric[], $4::text[])
+            AS t(transaction_ref, account_id, amount, description)
+        `, [
+          accepted.map(p => `TXN${p.paymentRef}`),
+          accepted.map(p => p.accountId),
+          accepted.map(p => p.item.amount),
+          accepted.map(p => `Payment: ${p.item.reference || p.paymentRef}`)
+        ]);
+        
+        const byRef = new Map(inserted.rows.map(payment => [payment.payment_ref, payment]));
+        accepted.forEach(p => {
+          results[p.index].status = 'created';
+          results[p.index].payment = this._formatPayment(byRef.get(p.paymentRef));
+        });
+      }
+      
+      await client.query('COMMIT');
+      
+      // Repeated keys within the batch resolve to the payment created for the first one
+      results.forEach(result => {
+        if (result.duplicateOf !== undefined) {
+          result.payment = results[result.duplicateOf].payment;
+          delete result.duplicateOf;
+        }
+      });
+      
+      return {
+        results,
+        summary: {
+          created: results.filter(result => result.status === 'created').length,
+          duplicate: results.filter(result => result.status === 'duplicate').length,
+          failed: results.filter(result => result.status === 'failed').length
+        }
+      };
+    } catch (error) {
+      await client.query('ROLLBACK');
+      logger.error('Batch payment initiation error:', error);
+      throw error;
+    } finally {
+      client.release();
+    }
+  }
+
   async getPayment(paymentId) {
     try {
       const payment = await pool.query_one(`
@@ -155,7 +383,13 @@ class PaymentsService {
 
   async listPayments(filters = {}) {
     try {
-      let query = 'SELECT * FROM payments WHERE 1=1';
+      const fields = parseFields(filters.fields, PAYMENT_COLUMNS);
+      const cursor = decodeCursor(filters.cursor);
+      let query = `
+        SELECT ${selectColumns(fields, PAYMENT_COLUMNS) || '*'},
+               created_at::text AS cursor_key, id AS cursor_id
+        FROM payments WHERE 1=1
+      `;
       const params = [];
       
       if (filters.sourceAccountId) {
@@ -168,17 +402,39 @@ class PaymentsService {
         query += ` AND status = $${params.length}`;
       }
       
-      query += ' ORDER BY created_at DESC';
+      if (filters.fromDate) {
+        params.push(filters.fromDate);
+        query += ` AND created_at >= $${params.length}::date`;
+      }
+      
+      if (filters.toDate) {
+        params.push(filters.toDate);
+        // toDate is inclusive: everything before the start of the next day
+        query += ` AND created_at < $${params.length}::date + INTERVAL '1 day'`;
+      }
+      
+      if (cursor) {
+        params.push(cursor.sortKey, cursor.id);
+        query += ` AND (created_at, id) < ($${params.length - 1}::timestamp, $${params.length}::uuid)`;
+      }
+      
+      query += ' ORDER BY created_at DESC, id DESC';
       
       if (filters.limit) {
         params.push(filters.limit);
         query += ` LIMIT $${params.length}`;
       }
       
+      if (filters.offset) {
+        params.push(filters.offset);
+        query += ` OFFSET $${params.length}`;
+      }
+      
       const result = await pool.query(query, params);
       
       return {
-        data: result.rows.map(payment => this._formatPayment(payment))
+        data: result.rows.map(payment => pickFields(this._formatPayment(payment), fields)),
+        nextCursor: nextCursor(result.rows, filters.limit)
       };
     } catch (error) {
       logger.error('List payments error:', error);
@@ -198,6 +454,7 @@ class PaymentsService {
       description: payment.description,
       status: payment.status,
       riskScore: payment.risk_score ? parseFloat(payment.risk_score) : null,
+      idempotencyKey: payment.idempotency_key || null,
       completedAt: payment.completed_at,
       createdAt: payment.created_at
     };
@@ -0,0 +1,49 @@
+/**
+ * Keyset Pagination Cursors
+ *
+ * A cursor holds the sort key and id of the last row of a page, so the next
+ * page starts right after that row instead of skipping an offset. Rows
+ * inserted meanwhile cannot shift later pages, and each page is an index
+ * range scan instead of a scan over every earlier row.
+ */
+
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+// Encode the sort key (timestamp text, full precision) and id of a row
+const encodeCursor = (sortKey, id) => Buffer.from(JSON.stringify([sortKey, id])).toString('base64url');
+
+// Decode a cursor parameter; null means start from the first row
+const decodeCursor = (value) => {
+  if (!value) {
+    return null;
+  }
+
+  let decoded;
+  try {
+    decoded = JSON.parse(Buffer.from(String(value), 'base64url').toString('utf8'));
+  } catch (error) {
+    decoded = null;
+  }
+
+  const [sortKey, id] = Array.isArray(decoded) ? decoded : [];
+  if (typeof sortKey !== 'string' || Number.isNaN(Date.parse(sortKey.replace(' ', 'T'))) ||
+      typeof id !== 'string' || !UUID_PATTERN.test(id)) {
+    const error = new Error('Invalid cursor');
+    error.statusCode = 400;
+    throw error;
+  }
+
+  return { sortKey, id };
+};
+
+// Cursor for the page after rows, or null when rows is the last page
+const nextCursor = (rows, limit) => {
+  if (!limit || rows.length < limit) {
+    return null;
+  }
+
+  const last = rows[rows.length - 1];
+  return encodeCursor(last.cursor_key, last.cursor_id);
+};
+
+module.exports = { encodeCursor, decodeCursor, nextCursor };
@@ -0,0 +1,49 @@
+/**
+ * Sparse Fieldset Helpers
+ *
+ * Lets list endpoints return only the fields a client asks for via
+ * `?fields=a,b,c`, selecting only the columns those fields need.
+ */
+
+// Parse a comma-separated fields parameter; null means all fields
+const parseFields = (value, columnMap) => {
+  if (!value) {
+    return null;
+  }
+
+  const fields = [...new Set(String(value).split(',').map(field => field.trim()).filter(Boolean))];
+  const unknown = fields.filter(field => !Object.prototype.hasOwnProperty.call(columnMap, field));
+
+  if (unknown.length) {
+    const error = new Error(`Unknown fields: ${unknown.join(', ')}`);
+    error.statusCode = 400;
+    throw error;
+  }
+
+  return fields.length ? fields : null;
+};
+
+// Build the SELECT list for the requested fields; null means the default list
+const selectColumns = (fields, columnMap) => {
+  if (!fields) {
+    return null;
+  }
+
+  const columns = new Set();
+  fields.forEach(field => columnMap[field].forEach(column => columns.add(column)));
+  return [...columns].join(', ');
+};
+
+// Keep only the requested fields of a formatted object
+const pickFields = (object, fields) => {
+  if (!fields) {
+    return object;
+  }
+
+  return fields.reduce((picked, field) => {
+    picked[field] = object[field];
+    return picked;
+  }, {});
+};
+
+module.exports = { parseFields, selectColumns, pickFields };
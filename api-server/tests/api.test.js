@@ -94,6 +94,32 @@ describe('API Server', () => {
         expect(balanceResponse.body).toHaveProperty('currency');
       }
     });
+
+    it('should get balances for multiple accounts in one request', async () => {
+      const accountsResponse = await request(app)
+        .get('/api/v1/accounts')
+        .set('Authorization', `Bearer ${accessToken}`);
+      
+      const ids = accountsResponse.body.data.map(account => account.id);
+      const missingId = '00000000-0000-4000-8000-000000000000';
+      
+      const response = await request(app)
+        .post('/api/v1/accounts/batch/balances')
+        .set('Authorization', `Bearer ${accessToken}`)
+        .send({ ids: [...ids, missingId] })
+        .expect(200);
+      
+      expect(response.body.data.map(balance => balance.accountId)).toEqual(ids);
+      expect(response.body.notFound).toEqual([missingId]);
+    });
+
+    it('should reject batch lookup without account IDs', async () => {
+      await request(app)
+        .post('/api/v1/accounts/batch')
+        .set('Authorization', `Bearer ${accessToken}`)
+        .send({ ids: [] })
+        .expect(400);
+    });
   });
 
   describe('Payments API', () => {
@@ -149,6 +175,66 @@ describe('API Server', () => {
       }
     });
 
+    it('should initiate bulk payments with per-item results', async () => {
+      if (!accountId) {
+        return;
+      }
+      
+      const key = `bulk_test_${Date.now()}`;
+      const response = await request(app)
+        .post('/api/v1/payments/bulk')
+        .set('Authorization', `Bearer ${accessToken}`)
+        .send({
+          payments: [
+            { sourceAccountId: accountId, destinationAccountNumber: '1009876543', amount: 10.00, idempotencyKey: key },
+            { sourceAccountId: accountId, destinationAccountNumber: '1009876543', amount: 10.00, idempotencyKey: key },
+            { sourceAccountId: accountId, destinationAccountNumber: '1009876543', amount: 999999999.00 }
+          ]
+        })
+        .expect(200);
+      
+      expect(response.body.results.map(result => result.status)).toEqual(['created', 'duplicate', 'failed']);
+      expect(response.body.results[1].payment.id).toBe(response.body.results[0].payment.id);
+      expect(response.body.results[2].error).toBe('Insufficient funds');
+      expect(response.body.summary).toEqual({ created: 1, duplicate: 1, failed: 1 });
+    });
+
+    it('should fail invalid bulk items without rejecting the batch', async () => {
+      const response = await request(app)
+        .post('/api/v1/payments/bulk')
+        .set('Authorization', `Bearer ${accessToken}`)
+        .send({
+          payments: [
+            { sourceAccountId: 'not-a-uuid', destinationAccountNumber: '1009876543', amount: 10.00 },
+            { sourceAccountId: accountId || '00000000-0000-0000-0000-000000000000', destinationAccountNumber: '1009876543', amount: -1 },
+            null
+          ]
+        })
+        .expect(200);
+      
+      expect(response.body.results.map(result => result.status)).toEqual(['failed', 'failed', 'failed']);
+      expect(response.body.results.map(result => result.error)).toEqual([
+        'Source account ID must be a UUID',
+        'Amount must be greater than 0',
+        'Payment must be an object'
+      ]);
+      expect(response.body.summary).toEqual({ created: 0, duplicate: 0, failed: 3 });
+    });
+
+    it('should reject a missing or oversized bulk payments array', async () => {
+      await request(app)
+        .post('/api/v1/payments/bulk')
+        .set('Authorization', `Bearer ${accessToken}`)
+        .send({})
+        .expect(400);
+      
+      await request(app)
+        .post('/api/v1/payments/bulk')
+        .set('Authorization', `Bearer ${accessToken}`)
+        .send({ payments: [] })
+        .expect(400);
+    });
+
     it('should reject payment without required fields', async () => {
       await request(app)
         .post('/api/v1/payments')
@@ -0,0 +1,49 @@
+/**
+ * Keyset Pagination Cursor Tests
+ */
+
+const { encodeCursor, decodeCursor, nextCursor } = require('../src/utils/cursor');
+
+const ID = '3f2b8c1e-5d4a-4e6f-9a7b-1c2d3e4f5a6b';
+
+describe('Pagination Cursors', () => {
+  it('should round-trip a full-precision timestamp and id', () => {
+    const cursor = encodeCursor('2026-10-19 12:34:56.123456', ID);
+
+    expect(decodeCursor(cursor)).toEqual({ sortKey: '2026-10-19 12:34:56.123456', id: ID });
+  });
+
+  it('should return null when no cursor is given', () => {
+    expect(decodeCursor(undefined)).toBeNull();
+    expect(decodeCursor('')).toBeNull();
+  });
+
+  it('should reject malformed cursors with a 400 error', () => {
+    const invalid = [
+      'not-a-cursor',
+      Buffer.from('{"a":1}').toString('base64url'),
+      encodeCursor('yesterday', ID),
+      encodeCursor('2026-10-19 12:34:56', 'abc')
+    ];
+
+    invalid.forEach(value => {
+      expect(() => decodeCursor(value)).toThrow('Invalid cursor');
+    });
+
+    try {
+      decodeCursor('not-a-cursor');
+    } catch (error) {
+      expect(error.statusCode).toBe(400);
+    }
+  });
+
+  it('should point past the last row of a full page only', () => {
+    const rows = [
+      { cursor_key: '2026-10-19 10:00:00', cursor_id: ID },
+      { cursor_key: '2026-10-19 09:00:00', cursor_id: ID }
+    ];
+
+    expect(decodeCursor(nextCursor(rows, 2))).toEqual({ sortKey: '2026-10-19 09:00:00', id: ID });
+    expect(nextCursor(rows, 3)).toBeNull();
+  });
+});
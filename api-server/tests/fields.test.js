@@ -0,0 +1,46 @@
+/**
+ * Sparse Fieldset Tests
+ */
+
+const { parseFields, selectColumns, pickFields } = require('../src/utils/fields');
+
+const COLUMNS = {
+  id: ['id'],
+  amount: ['amount'],
+  customer: ['c.first_name', 'c.last_name'],
+  fullName: ['c.first_name', 'c.last_name']
+};
+
+describe('Sparse Fieldsets', () => {
+  it('should return null when no fields are requested', () => {
+    expect(parseFields(undefined, COLUMNS)).toBeNull();
+    expect(parseFields('', COLUMNS)).toBeNull();
+    expect(selectColumns(null, COLUMNS)).toBeNull();
+  });
+
+  it('should parse, trim and de-duplicate requested fields', () => {
+    expect(parseFields(' id, amount ,id,', COLUMNS)).toEqual(['id', 'amount']);
+  });
+
+  it('should reject unknown fields with a 400 error', () => {
+    expect(() => parseFields('id,password', COLUMNS)).toThrow('Unknown fields: password');
+
+    try {
+      parseFields('password', COLUMNS);
+    } catch (error) {
+      expect(error.statusCode).toBe(400);
+    }
+  });
+
+  it('should select only the columns the fields need', () => {
+    expect(selectColumns(['amount', 'customer', 'fullName'], COLUMNS))
+      .toBe('amount, c.first_name, c.last_name');
+  });
+
+  it('should pick only the requested fields', () => {
+    const object = { id: 1, amount: 10, customer: { firstName: 'A' } };
+
+    expect(pickFields(object, ['amount'])).toEqual({ amount: 10 });
+    expect(pickFields(object, null)).toBe(object);
+  });
+});
@@ -0,0 +1,131 @@
+"""
+Batch Request Tests
+Chunking, result merging and partial failures of bulk payments and account lookups
+"""
+
+import gzip
+import json
+
+import pytest
+import requests
+
+from wekeza_sdk.accounts import WekezaAccounts
+from wekeza_sdk.payments import MAX_BATCH_SIZE, WekezaPayments
+
+
+class StubAuth:
+    def get_access_token(self):
+        return 'token'
+
+
+class StubResponse:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self._data = data
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+
+class StubEndpoints:
+    """Answers batch requests, failing the chunk numbers listed in fail_on"""
+
+    def __init__(self, limit=MAX_BATCH_SIZE, fail_on=()):
+        self.limit = limit
+        self.fail_on = set(fail_on)
+        self.bodies = []
+
+    def request(self, method, path, **kwargs):
+        body = kwargs['data']
+        if kwargs['headers'].get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        body = json.loads(body)
+        self.bodies.append(body)
+
+        items = body.get('payments') or body.get('ids')
+        if len(self.bodies) - 1 in self.fail_on or len(items) > self.limit:
+            return StubResponse(400, {'error': 'Bad batch'})
+        if path == '/payments/bulk':
+            return StubResponse(200, {
+                'results': [
+                    {'index': index, 'status': 'created', 'idempotencyKey': item['idempotencyKey']}
+                    for index, item in enumerate(items)
+                ],
+                'summary': {'created': len(items), 'duplicate': 0, 'failed': 0}
+            })
+        return StubResponse(200, {'data': [{'id': item} for item in items if item != 'unknown'],
+                                  'notFound': [item for item in items if item == 'unknown']})
+
+
+def make_payments(endpoints, **config):
+    return WekezaPayments({'base_url': 'http://api.test', **config}, StubAuth(), endpoints)
+
+
+def make_accounts(endpoints, **config):
+    return WekezaAccounts({'base_url': 'http://api.test', **config}, StubAuth(), endpoints)
+
+
+def test_bulk_payments_are_chunked_and_merged_in_input_order():
+    endpoints = StubEndpoints()
+    payments = [{'amount': index + 1} for index in range(7)]
+
+    result = make_payments(endpoints).initiate_payments(payments, chunk_size=3)
+
+    assert [len(body['payments']) for body in endpoints.bodies] == [3, 3, 1]
+    assert [item['index'] for item in result['results']] == list(range(7))
+    assert result['summary'] == {'created': 7, 'duplicate': 0, 'failed': 0}
+
+
+def test_generated_idempotency_keys_are_written_back():
+    endpoints = StubEndpoints()
+    payments = [{'amount': 1}, {'amount': 2, 'idempotencyKey': 'mine'}]
+
+    result = make_payments(endpoints).initiate_payments(payments)
+
+    assert payments[1]['idempotencyKey'] == 'mine'
+    assert payments[0]['idempotencyKey'].startswith('payment_')
+    assert [item['idempotencyKey'] for item in result['results']] == [p['idempotencyKey'] for p in payments]
+
+
+def test_retrying_after_a_failed_chunk_reuses_the_same_keys():
+    payments = [{'amount': index + 1} for index in range(4)]
+    client = make_payments(StubEndpoints(fail_on=[1]))
+
+    with pytest.raises(Exception) as error:
+        client.initiate_payments(payments, chunk_size=2)
+
+    partial = error.value.partial_result
+    assert [item['index'] for item in partial['results']] == [0, 1]
+    assert partial['summary']['created'] == 2
+
+    first_keys = [payment['idempotencyKey'] for payment in payments]
+    retry = StubEndpoints()
+    client.endpoints = retry
+    client.initiate_payments(payments, chunk_size=2)
+    assert [item['idempotencyKey'] for body in retry.bodies for item in body['payments']] == first_keys
+
+
+def test_default_chunk_size_follows_configured_server_limit():
+    endpoints = StubEndpoints(limit=100)
+    client = make_payments(endpoints, max_batch_size=100)
+
+    client.initiate_payments([{'amount': 1} for _ in range(250)])
+
+    assert [len(body['payments']) for body in endpoints.bodies] == [100, 100, 50]
+    with pytest.raises(ValueError):
+        client.initiate_payments([{'amount': 1}], chunk_size=101)
+
+
+def test_account_batches_follow_configured_server_limit():
+    endpoints = StubEndpoints(limit=2)
+    accounts = make_accounts(endpoints, max_batch_size=2)
+
+    result = accounts.get_balances(['a', 'unknown', 'b', 'c', 'd'])
+
+    assert [body['ids'] for body in endpoints.bodies] == [['a', 'unknown'], ['b', 'c'], ['d']]
+    assert [item['id'] for item in result['data']] == ['a', 'b', 'c', 'd']
+    assert result['notFound'] == ['unknown']
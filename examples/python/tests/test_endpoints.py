@@ -0,0 +1,205 @@
+"""
+Endpoint Pool Tests
+Ranking, cooldown, failover, hedging and probing
+"""
+
+import time
+
+import pytest
+import requests
+
+from wekeza_sdk import endpoints as endpoints_module
+from wekeza_sdk.endpoints import DEFAULT_TIMEOUT, WekezaEndpoints
+
+A = 'http://a.test'
+B = 'http://b.test'
+
+
+class FakeResponse:
+    def __init__(self, url, status_code):
+        self.url = url
+        self.status_code = status_code
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Fake requests.request answering per endpoint with (delay, status or exception)"""
+    behaviour = {A: (0.0, 200), B: (0.0, 200)}
+    calls = []
+
+    def fake_request(method, url, **kwargs):
+        base = A if url.startswith(A) else B
+        calls.append((method, base, kwargs))
+        delay, outcome = behaviour[base]
+        time.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(base, outcome)
+
+    monkeypatch.setattr(endpoints_module.requests, 'request', fake_request)
+    return behaviour, calls
+
+
+def called(calls):
+    return [base for _, base, _ in calls]
+
+
+def prime(pool, url, operation, elapsed=0.01, count=20):
+    for _ in range(count):
+        pool.record(url, elapsed, True, operation)
+
+
+def test_ranked_prefers_unmeasured_then_fastest():
+    pool = WekezaEndpoints([A, B])
+    pool.record(A, 0.5, True)
+
+    assert pool.ranked() == [B, A]
+
+    pool.record(B, 0.9, True)
+    assert pool.ranked() == [A, B]
+
+
+def test_latency_is_scored_per_operation():
+    pool = WekezaEndpoints([A, B])
+    pool.record(A, 2.0, True, 'list_payments')
+    pool.record(B, 0.1, True, 'get_balance')
+    pool.record(A, 0.05, True, 'get_balance')
+
+    assert pool.ranked('get_balance') == [A, B]
+    assert pool.ranked('list_payments') == [B, A]
+
+
+def test_failed_endpoint_ranks_last_until_cooldown_ends():
+    pool = WekezaEndpoints([A, B], failure_cooldown=0.05)
+    pool.record(A, 0.01, True)
+    pool.record(B, 0.5, True)
+    pool.record(A, 0.01, False)
+
+    assert pool.ranked() == [B, A]
+    time.sleep(0.06)
+    assert pool.ranked() == [A, B]
+
+
+def test_success_clears_cooldown():
+    pool = WekezaEndpoints([A, B], failure_cooldown=60)
+    pool.record(A, 0.01, False)
+    pool.record(A, 0.01, True)
+    pool.record(B, 0.5, True)
+
+    assert pool.ranked() == [A, B]
+
+
+def test_failover_on_network_error(server):
+    behaviour, calls = server
+    behaviour[A] = (0.0, requests.ConnectionError('down'))
+
+    response = WekezaEndpoints([A, B]).request('GET', '/accounts')
+
+    assert response.url == B
+    assert called(calls) == [A, B]
+
+
+def test_failover_on_retryable_status(server):
+    behaviour, calls = server
+    behaviour[A] = (0.0, 503)
+
+    assert WekezaEndpoints([A, B]).request('GET', '/accounts').url == B
+
+
+def test_non_idempotent_request_is_not_retried(server):
+    behaviour, calls = server
+    behaviour[A] = (0.0, 503)
+
+    response = WekezaEndpoints([A, B]).request('POST', '/payments', json={})
+
+    assert response.status_code == 503
+    assert called(calls) == [A]
+
+
+def test_last_endpoint_error_is_raised(server):
+    behaviour, calls = server
+    behaviour[A] = (0.0, requests.ConnectionError('down'))
+    behaviour[B] = (0.0, requests.Timeout('slow'))
+
+    with pytest.raises(requests.Timeout):
+        WekezaEndpoints([A, B]).request('GET', '/accounts')
+
+
+def test_default_timeout_is_applied(server):
+    _, calls = server
+    pool = WekezaEndpoints([A])
+
+    pool.request('GET', '/accounts')
+    pool.request('GET', '/accounts', timeout=1)
+
+    assert calls[0][2]['timeout'] == DEFAULT_TIMEOUT
+    assert calls[1][2]['timeout'] == 1
+
+
+def test_slow_primary_is_hedged_within_budget(server):
+    behaviour, calls = server
+    behaviour[A] = (0.3, 200)
+    pool = WekezaEndpoints([A, B], hedge_budget=1.0)
+    prime(pool, A, 'get_balance')
+    pool.record(B, 0.02, True, 'get_balance')
+
+    response = pool.request('GET', '/balance', hedge=True, operation='get_balance')
+
+    assert response.url == B
+    assert sorted(called(calls)) == [A, B]
+
+
+def test_hedging_stops_when_budget_is_spent(server):
+    behaviour, calls = server
+    behaviour[A] = (0.1, 200)
+    pool = WekezaEndpoints([A, B], hedge_budget=0.0)
+    prime(pool, A, 'get_balance')
+    pool.record(B, 0.02, True, 'get_balance')
+
+    response = pool.request('GET', '/balance', hedge=True, operation='get_balance')
+
+    assert response.url == A
+    assert called(calls) == [A]
+
+
+def test_hedging_needs_an_operation(server):
+    behaviour, calls = server
+    behaviour[A] = (0.1, 200)
+    pool = WekezaEndpoints([A, B], hedge_budget=1.0)
+    prime(pool, A, 'get_balance')
+    pool.record(B, 0.02, True)
+
+    assert pool.hedge_delay('get_account') is None
+    assert pool.request('GET', '/balance', hedge=True).url == A
+    assert called(calls) == [A]
+
+
+def test_lagging_endpoint_is_probed_with_named_requests(server):
+    _, calls = server
+    pool = WekezaEndpoints([A, B], hedge_budget=1.0, probe_interval=0.05)
+    prime(pool, A, 'get_balance')
+    pool.record(B, 0.5, True, 'get_balance')
+    time.sleep(0.06)
+
+    pool.request('GET', '/balance', operation='get_balance')
+    pool._get_executor('probe').shutdown(wait=True)
+
+    assert sorted(called(calls)) == [A, B]
+    # Probes score the endpoint but do not feed the hedge delay
+    assert len(pool._samples['get_balance']) == 22
+
+
+def test_probes_are_skipped_without_budget_or_operation(server):
+    _, calls = server
+    pool = WekezaEndpoints([A, B], hedge_budget=0.0, probe_interval=0.0)
+    pool.record(B, 0.5, True, 'get_balance')
+    pool.record(B, 0.5, True)
+
+    pool.request('GET', '/balance', operation='get_balance')
+    pool.hedge_budget = 1.0
+    pool.request('GET', '/payments')
+
+    assert called(calls) == [A, A]
@@ -0,0 +1,278 @@
+"""
+Reconciliation Tests
+Key joins, tolerance matching and date partitions
+"""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from wekeza_sdk.reconciliation import (
+    TRANSACTION_FIELDS,
+    WekezaReconciliation,
+    _bucket_join,
+    _FreeList,
+    _rank_within_key,
+)
+
+
+def ledger(amount, date, reference=None, idempotency_key=None):
+    return {'amount': amount, 'date': date, 'reference': reference, 'idempotency_key': idempotency_key}
+
+
+def payment(amount, date, reference=None, idempotency_key=None):
+    return {
+        'amount': amount,
+        'createdAt': f'{date}T10:15:00.000Z',
+        'reference': reference,
+        'idempotencyKey': idempotency_key
+    }
+
+
+def pairs(result, kind='matched'):
+    return [(pair['ledger'], pair['remote']) for pair in result[kind]]
+
+
+def test_rank_within_key():
+    assert _rank_within_key(np.array([7, 3, 7, 7, 3])).tolist() == [0, 0, 1, 2, 1]
+
+
+def test_bucket_join_pairs_each_key_at_most_min_count_times():
+    left, right = _bucket_join(np.array([5, 5, 5, 9]), np.array([5, 9, 5, 1]))
+
+    assert sorted(zip(left.tolist(), right.tolist())) == [(0, 0), (1, 2), (3, 1)]
+
+
+def test_free_list_skips_taken_slots():
+    free = _FreeList(5)
+    free.take(2)
+    free.take(3)
+
+    assert free.right(2) == 4
+    assert free.left(3) == 1
+    free.take(4)
+    assert free.right(2) == 5
+    free.take(0)
+    free.take(1)
+    assert free.left(4) == -1
+
+
+def test_idempotency_key_join_beats_reference():
+    book = [ledger(100, '2026-10-01', reference='R1', idempotency_key='K1')]
+    remote = [
+        payment(100, '2026-10-01', reference='R1', idempotency_key='OTHER'),
+        payment(100, '2026-10-01', reference='R9', idempotency_key='K1')
+    ]
+
+    result = WekezaReconciliation().reconcile(book, remote)
+
+    assert pairs(result) == [(book[0], remote[1])]
+    assert result['matched'][0]['match_type'] == 'idempotency_key'
+    assert result['missing_in_ledger'] == [remote[0]]
+
+
+def test_reference_join_with_transaction_fields():
+    book = [ledger(50, '2026-10-01', reference='TX1')]
+    remote = [{'transactionRef': 'TX1', 'amount': 50, 'transactionDate': '2026-10-01T08:00:00'}]
+
+    result = WekezaReconciliation().reconcile(book, remote, TRANSACTION_FIELDS)
+
+    assert pairs(result) == [(book[0], remote[0])]
+    assert result['matched'][0]['match_type'] == 'reference'
+
+
+def test_duplicate_keys_pair_once():
+    book = [
+        ledger(10, '2026-10-01', idempotency_key='K1'),
+        ledger(10, '2026-10-01', idempotency_key='K1')
+    ]
+    remote = [
+        payment(10, '2026-10-01', idempotency_key='K1'),
+        payment(99, '2026-10-05', idempotency_key='K2'),
+        payment(99, '2026-10-05', idempotency_key='K2')
+    ]
+
+    result = WekezaReconciliation().reconcile(book, remote)
+
+    assert len(result['matched']) == 1
+    assert len(result['missing_in_remote']) == 1
+    assert result['missing_in_ledger'] == remote[1:]
+
+
+def test_key_match_outside_tolerance_is_mismatched():
+    book = [
+        ledger(100, '2026-10-01', reference='R1'),
+        ledger(100, '2026-10-01', reference='R2')
+    ]
+    remote = [
+        payment(100.5, '2026-10-01', reference='R1'),
+        payment(100, '2026-10-03', reference='R2')
+    ]
+
+    result = WekezaReconciliation(amount_tolerance=0.25, date_tolerance_days=1).reconcile(book, remote)
+
+    assert [pair['differences'] for pair in result['mismatched']] == [['amount'], ['date']]
+    assert result['matched'] == []
+
+
+def test_exact_amount_prefers_closest_date():
+    book = [ledger(75, '2026-10-10')]
+    remote = [
+        payment(75, '2026-10-12'),
+        payment(75, '2026-10-09'),
+        payment(75, '2026-10-15')
+    ]
+
+    result = WekezaReconciliation(date_tolerance_days=2).reconcile(book, remote)
+
+    assert pairs(result) == [(book[0], remote[1])]
+    assert result['matched'][0]['match_type'] == 'tolerance'
+    assert len(result['missing_in_ledger']) == 2
+
+
+def test_amount_tolerance_prefers_closest_amount():
+    book = [ledger(100, '2026-10-01')]
+    remote = [payment(100.9, '2026-10-01'), payment(99.8, '2026-10-01'), payment(100.3, '2026-10-01')]
+
+    result = WekezaReconciliation(amount_tolerance=1.0).reconcile(book, remote)
+
+    assert pairs(result) == [(book[0], remote[1])]
+
+
+def test_exact_amount_on_another_day_beats_near_amount_on_same_day():
+    book = [ledger(100, '2026-10-01')]
+    remote = [payment(100.1, '2026-10-01'), payment(100, '2026-10-02')]
+
+    result = WekezaReconciliation(amount_tolerance=0.5, date_tolerance_days=1).reconcile(book, remote)
+
+    assert pairs(result) == [(book[0], remote[1])]
+
+
+def test_amounts_outside_tolerance_do_not_match():
+    book = [ledger(100, '2026-10-01'), ledger(100, '2026-10-01')]
+    remote = [payment(101.01, '2026-10-01'), payment(100, '2026-10-04')]
+
+    result = WekezaReconciliation(amount_tolerance=1.0, date_tolerance_days=2).reconcile(book, remote)
+
+    assert result['matched'] == []
+    assert len(result['missing_in_remote']) == 2
+    assert len(result['missing_in_ledger']) == 2
+
+
+def test_negative_amounts():
+    book = [ledger(-50, '2026-10-01'), ledger(-20, '2026-10-01')]
+    remote = [
+        payment(50, '2026-10-01'),
+        payment(-50.5, '2026-10-01'),
+        payment(-49.9, '2026-10-01'),
+        payment(-20, '2026-10-01')
+    ]
+
+    result = WekezaReconciliation(amount_tolerance=1.0).reconcile(book, remote)
+
+    assert sorted(pairs(result), key=lambda pair: pair[0]['amount']) == [
+        (book[0], remote[2]),
+        (book[1], remote[3])
+    ]
+    assert result['missing_in_ledger'] == [remote[0], remote[1]]
+
+
+def test_each_record_is_matched_at_most_once():
+    rng = np.random.default_rng(7)
+    days = [f'2026-10-{day:02d}' for day in range(1, 6)]
+    book = [ledger(int(rng.integers(1, 40)), days[rng.integers(0, 5)]) for _ in range(400)]
+    remote = [payment(int(rng.integers(1, 40)), days[rng.integers(0, 5)]) for _ in range(400)]
+
+    result = WekezaReconciliation(date_tolerance_days=1).reconcile(book, remote)
+    matched = pairs(result)
+
+    assert len({id(left) for left, _ in matched}) == len(matched)
+    assert len({id(right) for _, right in matched}) == len(matched)
+    assert len(matched) + len(result['missing_in_remote']) == len(book)
+    assert len(matched) + len(result['missing_in_ledger']) == len(remote)
+    for left, right in matched:
+        assert left['amount'] == right['amount']
+        gap = np.datetime64(left['date']) - np.datetime64(right['createdAt'][:10])
+        assert abs(gap.astype(int)) <= 1
+
+    # Same-day exact matches alone already reach the multiset intersection
+    same_day = Counter((r['amount'], r['date']) for r in book) & \
+        Counter((r['amount'], r['createdAt'][:10]) for r in remote)
+    assert len(matched) >= sum(same_day.values())
+
+
+def test_empty_inputs():
+    reconciliation = WekezaReconciliation(amount_tolerance=1.0, date_tolerance_days=2)
+    book = [ledger(10, '2026-10-01')]
+
+    assert reconciliation.reconcile([], []) == {
+        'matched': [], 'mismatched': [], 'missing_in_remote': [], 'missing_in_ledger': []
+    }
+    assert reconciliation.reconcile(book, [])['missing_in_remote'] == book
+    assert reconciliation.reconcile([], [payment(10, '2026-10-01')])['missing_in_ledger']
+    assert list(reconciliation.reconcile_partitions([([], []), ([], [])])) == [
+        reconciliation.reconcile([], []),
+        reconciliation.reconcile([], [])
+    ]
+
+
+def test_partition_carries_rows_into_the_next_day():
+    book = ledger(30, '2026-10-01')
+    remote = payment(30, '2026-10-02')
+    reconciliation = WekezaReconciliation(date_tolerance_days=1)
+
+    results = list(reconciliation.reconcile_partitions([([book], []), ([], [remote])]))
+
+    assert results[0]['missing_in_remote'] == []
+    assert pairs(results[1]) == [(book, remote)]
+    assert len(results) == 2
+
+
+def test_carried_rows_are_reported_once_past_the_horizon():
+    early = ledger(30, '2026-10-01')
+    late = payment(45, '2026-10-03')
+    reconciliation = WekezaReconciliation(date_tolerance_days=1)
+
+    results = list(reconciliation.reconcile_partitions([
+        ([early], []),
+        ([], []),
+        ([], [late]),
+    ]))
+
+    assert [result['missing_in_remote'] for result in results] == [[], [], [early], []]
+    # Rows still inside the horizon after the last partition are reported at the end
+    assert [result['missing_in_ledger'] for result in results] == [[], [], [], [late]]
+
+
+def test_partitions_without_date_tolerance_do_not_carry():
+    book = ledger(30, '2026-10-01')
+    remote = payment(30, '2026-10-02')
+
+    results = list(WekezaReconciliation().reconcile_partitions([([book], []), ([], [remote])]))
+
+    assert [result['missing_in_remote'] for result in results] == [[book], []]
+    assert [result['missing_in_ledger'] for result in results] == [[], [remote]]
+
+
+@pytest.mark.parametrize('tolerance', [0.0, 0.5])
+def test_partitioned_matches_stay_within_tolerance(tolerance):
+    rng = np.random.default_rng(11)
+    days = [f'2026-10-{day:02d}' for day in range(1, 8)]
+    book = [ledger(int(rng.integers(4, 80)) / 4, day) for day in days for _ in range(30)]
+    remote = [payment(int(rng.integers(4, 80)) / 4, day) for day in days for _ in range(30)]
+    partitions = [
+        ([r for r in book if r['date'] == day], [r for r in remote if r['createdAt'][:10] == day])
+        for day in days
+    ]
+
+    parts = list(WekezaReconciliation(amount_tolerance=tolerance, date_tolerance_days=1)
+                 .reconcile_partitions(partitions))
+    matched = [pair for result in parts for pair in pairs(result)]
+
+    assert len(matched) + sum(len(result['missing_in_remote']) for result in parts) == len(book)
+    assert len(matched) + sum(len(result['missing_in_ledger']) for result in parts) == len(remote)
+    for left, right in matched:
+        assert abs(left['amount'] - right['amount']) <= tolerance
+        gap = np.datetime64(left['date']) - np.datetime64(right['createdAt'][:10])
+        assert abs(gap.astype(int)) <= 1
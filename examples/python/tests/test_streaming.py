@@ -0,0 +1,91 @@
+"""
+Streaming Tests
+Chunk-boundary handling of the incremental JSON parser
+"""
+
+import json
+
+import pytest
+
+from wekeza_sdk.streaming import iter_json_items, iter_pages
+
+BODY = {
+    'total': 12.5,
+    'data': [
+        1.5,
+        -2,
+        3e5,
+        -4.25E-3,
+        0,
+        True,
+        None,
+        'Café ☕',
+        {'id': 'tx-1', 'amount': 1000.75, 'tags': [1, [2, 3]]},
+        [10, 20.5],
+    ],
+    'count': 10,
+}
+
+
+def chunked(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64 * 1024])
+def test_items_survive_any_chunk_size(size):
+    data = json.dumps(BODY, ensure_ascii=False).encode('utf-8')
+
+    assert list(iter_json_items(chunked(data, size))) == BODY['data']
+
+
+@pytest.mark.parametrize('chunks, expected', [
+    ([b'{"data":[1.', b'5]}'], [1.5]),
+    ([b'{"data":[1', b'2]}'], [12]),
+    ([b'{"data":[1e', b'5]}'], [1e5]),
+    ([b'{"data":[2.5e', b'-', b'3]}'], [2.5e-3]),
+    ([b'{"data":[-', b'7]}'], [-7]),
+])
+def test_numbers_split_across_chunks(chunks, expected):
+    assert list(iter_json_items(chunks)) == expected
+
+
+def test_top_level_number_split_before_data():
+    chunks = [b'{"total": 12.', b'5, "data": [1]}']
+
+    assert list(iter_json_items(chunks)) == [1]
+
+
+def test_truncated_stream_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_items([b'{"data":[{"id": "tx-1"}, {"id": ']))
+
+
+def test_other_keys_are_skipped():
+    chunks = [b'{"meta": {"data": [0]}, "data": ', b'[1, 2]}']
+
+    assert list(iter_json_items(chunks)) == [1, 2]
+
+
+def test_iter_pages_follows_cursors_until_the_last_page():
+    pages = {None: ([0, 1], 'c1'), 'c1': ([2, 3], 'c2'), 'c2': ([4], None)}
+    calls = []
+
+    def fetch_page(cursor, limit):
+        calls.append((cursor, limit))
+        return pages[cursor]
+
+    assert list(iter_pages(fetch_page, 2)) == [0, 1, 2, 3, 4]
+    assert calls == [(None, 2), ('c1', 2), ('c2', 2)]
+
+
+def test_iter_pages_fetches_lazily():
+    calls = []
+
+    def fetch_page(cursor, limit):
+        calls.append(cursor)
+        return [1, 2], 'next'
+
+    items = iter_pages(fetch_page, 2)
+    assert calls == []
+    assert [next(items), next(items), next(items)] == [1, 2, 1]
+    assert calls == [None, 'next']
@@ -7,6 +7,8 @@ from .auth import WekezaAuth
 from .accounts import WekezaAccounts
 from .payments import WekezaPayments
 from .webhooks import WekezaWebhooks, WebhookVerificationError, InvalidWebhookPayloadError
+from .endpoints import WekezaEndpoints
+from .reconciliation import WekezaReconciliation
 
 __version__ = "1.0.0"
 __all__ = [
@@ -15,6 +17,8 @@ __all__ = [
     "WekezaAccounts",
     "WekezaPayments",
     "WekezaWebhooks",
+    "WekezaEndpoints",
+    "WekezaReconciliation",
     "WebhookVerificationError",
     "InvalidWebhookPayloadError"
 ]
@@ -4,39 +4,61 @@ Handles account information and transaction queries
 """
 
 import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from .compression import ACCEPT_ENCODING, compress_json
+from .endpoints import DEFAULT_TIMEOUT, WekezaEndpoints
+from .streaming import STREAM_CHUNK_SIZE, iter_json_items, iter_pages
+
+# Largest number of account IDs the API accepts in one batch request by
+# default; servers configured with a lower BATCH_MAX_SIZE need max_batch_size set
+MAX_BATCH_SIZE = 1000
 
 
 class WekezaAccounts:
     """Handles account-related API calls"""
     
-    def __init__(self, config: Dict[str, str], auth):
+    def __init__(self, config: Dict[str, Any], auth, endpoints: Optional[WekezaEndpoints] = None):
         self.base_url = config['base_url']
         self.auth = auth
+        self.endpoints = endpoints or WekezaEndpoints(
+            config.get('base_urls') or [self.base_url],
+            hedge_budget=config.get('hedge_budget', 0.05),
+            timeout=config.get('timeout', DEFAULT_TIMEOUT)
+        )
+        self.hedge = bool(config.get('hedge_requests'))
+        self.max_batch_size = int(config.get('max_batch_size') or MAX_BATCH_SIZE)
     
     def _get_headers(self) -> Dict[str, str]:
         """Get authenticated headers"""
         token = self.auth.get_access_token()
         return {
             'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'Accept-Encoding': ACCEPT_ENCODING
         }
     
-    def list_accounts(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def list_accounts(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         List all accounts for the authenticated user
         
         Args:
             params: Query parameters
+            fields: Account fields to return (default: all)
             
         Returns:
             Dict containing account list
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/accounts",
+            response = self.endpoints.request(
+                'GET',
+                "/accounts",
                 headers=self._get_headers(),
-                params=params or {}
+                params=self._build_params(params, fields)
             )
             response.raise_for_status()
             return response.json()
@@ -54,8 +76,11 @@ class WekezaAccounts:
             Dict containing account details
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/accounts/{account_id}",
+            response = self.endpoints.request(
+                'GET',
+                f"/accounts/{account_id}",
+                hedge=self.hedge,
+                operation='get_account',
                 headers=self._get_headers()
             )
             response.raise_for_status()
@@ -74,8 +99,11 @@ class WekezaAccounts:
             Dict containing balance information
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/accounts/{account_id}/balance",
+            response = self.endpoints.request(
+                'GET',
+                f"/accounts/{account_id}/balance",
+                hedge=self.hedge,
+                operation='get_balance',
                 headers=self._get_headers()
             )
             response.raise_for_status()
@@ -83,28 +111,154 @@ class WekezaAccounts:
         except Exception as e:
             raise self._handle_error(e)
     
-    def get_transactions(self, account_id: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def get_accounts(self, account_ids: List[str], chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get details for multiple accounts
+        
+        Large inputs are split into chunks of chunk_size IDs, one batch
+        request per chunk.
+        
+        Args:
+            account_ids: Account IDs
+            chunk_size: Number of IDs sent per request (default: max_batch_size)
+            
+        Returns:
+            Dict with accounts in request order (data) and unknown IDs (notFound)
+        """
+        return self._batch("/accounts/batch", account_ids, chunk_size)
+    
+    def get_balances(self, account_ids: List[str], chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get balances for multiple accounts
+        
+        Large inputs are split into chunks of chunk_size IDs, one batch
+        request per chunk.
+        
+        Args:
+            account_ids: Account IDs
+            chunk_size: Number of IDs sent per request (default: max_batch_size)
+            
+        Returns:
+            Dict with balances in request order (data) and unknown IDs (notFound)
+        """
+        return self._batch("/accounts/batch/balances", account_ids, chunk_size)
+    
+    def get_transactions(
+        self,
+        account_id: str,
+        params: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         Get account transactions
         
         Args:
             account_id: Account ID
             params: Query parameters (fromDate, toDate, page, limit)
+            fields: Transaction fields to return (default: all)
             
         Returns:
             Dict containing transaction list
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/accounts/{account_id}/transactions",
+            response = self.endpoints.request(
+                'GET',
+                f"/accounts/{account_id}/transactions",
                 headers=self._get_headers(),
-                params=params or {}
+                params=self._build_params(params, fields)
             )
             response.raise_for_status()
             return response.json()
         except Exception as e:
             raise self._handle_error(e)
     
+    def iter_transactions(
+        self,
+        account_id: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream account transactions across all pages
+        
+        Each transaction is yielded as soon as it is parsed from the response
+        body, and the next page is requested when the current one runs out.
+        
+        Args:
+            account_id: Account ID
+            params: Query parameters (fromDate, toDate, type)
+            page_size: Number of transactions requested per page
+            fields: Transaction fields to return (default: all)
+            
+        Returns:
+            Iterator over transactions
+        """
+        def fetch_page(cursor: Optional[str], limit: int) -> Tuple[Iterator[Dict[str, Any]], Optional[str]]:
+            page_params = {**self._build_params(params, fields), 'limit': limit}
+            if cursor:
+                page_params['cursor'] = cursor
+            return self._stream(f"/accounts/{account_id}/transactions", page_params)
+        
+        return iter_pages(fetch_page, page_size)
+    
+    def _batch(self, path: str, account_ids: List[str], chunk_size: Optional[int]) -> Dict[str, Any]:
+        """Look up account IDs in chunks and merge the results"""
+        chunk_size = chunk_size or self.max_batch_size
+        if not 1 <= chunk_size <= self.max_batch_size:
+            raise ValueError(f"chunk_size must be between 1 and {self.max_batch_size}")
+        
+        merged = {'data': [], 'notFound': []}
+        try:
+            for start in range(0, len(account_ids), chunk_size):
+                body, encoding_headers = compress_json({'ids': account_ids[start:start + chunk_size]})
+                response = self.endpoints.request(
+                    'POST',
+                    path,
+                    idempotent=True,
+                    data=body,
+                    headers={**self._get_headers(), **encoding_headers}
+                )
+                response.raise_for_status()
+                page = response.json()
+                merged['data'].extend(page.get('data', []))
+                merged['notFound'].extend(page.get('notFound', []))
+        except Exception as e:
+            raise self._handle_error(e)
+        return merged
+    
+    @staticmethod
+    def _build_params(params: Optional[Dict[str, Any]], fields: Optional[List[str]]) -> Dict[str, Any]:
+        """Merge query parameters with a sparse fieldset"""
+        query = dict(params or {})
+        if fields:
+            query['fields'] = ','.join(fields)
+        return query
+    
+    def _stream(self, path: str, params: Dict[str, Any]) -> Tuple[Iterator[Dict[str, Any]], Optional[str]]:
+        """Request a list page, returning its streamed data array and next cursor"""
+        try:
+            response = self.endpoints.request(
+                'GET',
+                path,
+                headers=self._get_headers(),
+                params=params,
+                stream=True
+            )
+            response.raise_for_status()
+        except Exception as e:
+            raise self._handle_error(e)
+        return self._iter_data(response), response.headers.get('X-Next-Cursor')
+    
+    def _iter_data(self, response: requests.Response) -> Iterator[Dict[str, Any]]:
+        """Yield the data array of a streamed list response"""
+        try:
+            yield from iter_json_items(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+        except Exception as e:
+            raise self._handle_error(e)
+        finally:
+            response.close()
+    
     def _handle_error(self, error: Exception) -> Exception:
         """Handle API errors"""
         if isinstance(error, requests.HTTPError):
@@ -3,18 +3,24 @@ Wekeza API Authentication Module
 Handles OAuth 2.0 token management with caching
 """
 
-import requests
 import time
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
+
+from .endpoints import DEFAULT_TIMEOUT, WekezaEndpoints
 
 
 class WekezaAuth:
     """Handles authentication and token management for Wekeza API"""
     
-    def __init__(self, config: Dict[str, str]):
+    def __init__(self, config: Dict[str, Any]):
         self.client_id = config['client_id']
         self.client_secret = config['client_secret']
         self.oauth_url = config['oauth_url']
+        self.endpoints = WekezaEndpoints(
+            config.get('oauth_urls') or [self.oauth_url],
+            hedge_budget=config.get('hedge_budget', 0.05),
+            timeout=config.get('timeout', DEFAULT_TIMEOUT)
+        )
         self.access_token: Optional[str] = None
         self.token_expiry: Optional[float] = None
         self.refresh_token: Optional[str] = None
@@ -48,8 +54,10 @@ class WekezaAuth:
             str: Access token
         """
         try:
-            response = requests.post(
-                f"{self.oauth_url}/token",
+            response = self.endpoints.request(
+                'POST',
+                "/token",
+                idempotent=True,
                 data={
                     'grant_type': 'client_credentials',
                     'client_id': self.client_id,
@@ -82,8 +90,10 @@ class WekezaAuth:
             str: Access token
         """
         try:
-            response = requests.post(
-                f"{self.oauth_url}/token",
+            response = self.endpoints.request(
+                'POST',
+                "/token",
+                idempotent=True,
                 data={
                     'grant_type': 'refresh_token',
                     'refresh_token': self.refresh_token,
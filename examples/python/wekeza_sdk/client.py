@@ -5,18 +5,20 @@ Main client class
 
 import os
 from dotenv import load_dotenv
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 from .auth import WekezaAuth
 from .accounts import WekezaAccounts
-from .payments import WekezaPayments
+from .payments import MAX_BATCH_SIZE, WekezaPayments
 from .webhooks import WekezaWebhooks
+from .endpoints import DEFAULT_TIMEOUT, WekezaEndpoints
+from .reconciliation import WekezaReconciliation
 
 
 class WekezaClient:
     """Main Wekeza API client"""
     
-    def __init__(self, config: Dict[str, str]):
+    def __init__(self, config: Dict[str, Any]):
         """
         Initialize Wekeza client
         
@@ -26,6 +28,13 @@ class WekezaClient:
                 - client_secret: OAuth client secret
                 - base_url: API base URL (optional)
                 - oauth_url: OAuth server URL (optional)
+                - base_urls: API base URLs for failover, best first (optional)
+                - oauth_urls: OAuth server URLs for failover, best first (optional)
+                - hedge_requests: Hedge idempotent reads across endpoints (optional)
+                - hedge_budget: Maximum fraction of extra hedged requests (optional)
+                - timeout: (connect, read) timeout in seconds (optional)
+                - max_batch_size: Largest batch the server accepts, i.e. its
+                  BATCH_MAX_SIZE (optional, default 1000)
                 - webhook_secret: Webhook secret (optional)
         """
         # Validate required config
@@ -37,13 +46,25 @@ class WekezaClient:
             'client_secret': config['client_secret'],
             'base_url': config.get('base_url', 'https://sandbox.wekeza.com/api/v1'),
             'oauth_url': config.get('oauth_url', 'https://sandbox.wekeza.com/oauth'),
-            'webhook_secret': config.get('webhook_secret')
+            'webhook_secret': config.get('webhook_secret'),
+            'hedge_requests': bool(config.get('hedge_requests', False)),
+            'hedge_budget': config.get('hedge_budget', 0.05),
+            'timeout': config.get('timeout', DEFAULT_TIMEOUT),
+            'max_batch_size': int(config.get('max_batch_size') or MAX_BATCH_SIZE)
         }
+        self.config['base_urls'] = config.get('base_urls') or [self.config['base_url']]
+        self.config['oauth_urls'] = config.get('oauth_urls') or [self.config['oauth_url']]
         
         # Initialize modules
+        self.endpoints = WekezaEndpoints(
+            self.config['base_urls'],
+            hedge_budget=self.config['hedge_budget'],
+            timeout=self.config['timeout']
+        )
         self.auth = WekezaAuth(self.config)
-        self.accounts = WekezaAccounts(self.config, self.auth)
-        self.payments = WekezaPayments(self.config, self.auth)
+        self.accounts = WekezaAccounts(self.config, self.auth, self.endpoints)
+        self.payments = WekezaPayments(self.config, self.auth, self.endpoints)
+        self.reconciliation = WekezaReconciliation(self.accounts, self.payments)
         
         if self.config['webhook_secret']:
             self.webhooks = WekezaWebhooks(self.config['webhook_secret'])
@@ -63,5 +84,9 @@ class WekezaClient:
             'client_secret': os.getenv('WEKEZA_CLIENT_SECRET'),
             'base_url': os.getenv('WEKEZA_BASE_URL'),
             'oauth_url': os.getenv('WEKEZA_OAUTH_URL'),
-            'webhook_secret': os.getenv('WEBHOOK_SECRET')
+            'webhook_secret': os.getenv('WEBHOOK_SECRET'),
+            'base_urls': [url for url in os.getenv('WEKEZA_BASE_URLS', '').split(',') if url],
+            'oauth_urls': [url for url in os.getenv('WEKEZA_OAUTH_URLS', '').split(',') if url],
+            'hedge_requests': os.getenv('WEKEZA_HEDGE_REQUESTS', '').lower() in ('1', 'true', 'yes'),
+            'max_batch_size': int(os.getenv('WEKEZA_MAX_BATCH_SIZE') or MAX_BATCH_SIZE)
         })
@@ -0,0 +1,38 @@
+"""
+Wekeza API Compression Module
+Response encoding negotiation and request body compression
+"""
+
+import gzip
+import json
+from typing import Any, Dict, Tuple
+
+try:
+    import brotli  # noqa: F401 - lets urllib3 decode br responses
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+# Request bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+
+
+def compress_json(data: Any, min_size: int = MIN_COMPRESS_SIZE) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Serialize a request body, gzip-compressing it when it is large enough
+
+    Args:
+        data: JSON-serializable request body
+        min_size: Smallest body size, in bytes, worth compressing
+
+    Returns:
+        Tuple of (body bytes, extra headers)
+    """
+    body = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    if len(body) < min_size:
+        return body, {}
+    return gzip.compress(body, compresslevel=6), {'Content-Encoding': 'gzip'}
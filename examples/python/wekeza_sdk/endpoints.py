@@ -0,0 +1,365 @@
+"""
+Wekeza API Endpoints Module
+Latency-aware endpoint selection, failover and request hedging
+"""
+
+import requests
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+# Status codes that mark an endpoint unhealthy and are safe to fail over on
+RETRYABLE_STATUS_CODES = (502, 503, 504)
+
+# Maximum number of hedge tokens that can be saved up for a burst
+_HEDGE_BURST = 10.0
+
+# Minimum number of latency samples before hedging is enabled
+_MIN_SAMPLES = 20
+
+# Default (connect, read) timeout in seconds for every request
+DEFAULT_TIMEOUT = (3.05, 30.0)
+
+# Threads available for hedge and probe requests
+_HEDGE_WORKERS = 8
+_PROBE_WORKERS = 2
+
+
+class WekezaEndpoints:
+    """Routes requests to the fastest healthy endpoint"""
+
+    def __init__(
+        self,
+        urls: List[str],
+        hedge_budget: float = 0.05,
+        hedge_percentile: float = 95.0,
+        failure_cooldown: float = 30.0,
+        probe_interval: float = 30.0,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT
+    ):
+        """
+        Initialize endpoint pool
+
+        Args:
+            urls: Endpoint base URLs, in order of preference
+            hedge_budget: Maximum fraction of extra requests sent as hedges
+            hedge_percentile: Latency percentile to wait before hedging
+            failure_cooldown: Seconds an endpoint is ranked last after a failure
+            probe_interval: Seconds after which an endpoint that is not being
+                used is measured again with a copy of a named GET request
+            timeout: Default (connect, read) timeout in seconds
+        """
+        self.urls = [url.rstrip('/') for url in urls if url]
+        if not self.urls:
+            raise ValueError("At least one endpoint URL is required")
+
+        self.hedge_budget = hedge_budget
+        self.hedge_percentile = hedge_percentile
+        self.failure_cooldown = failure_cooldown
+        self.probe_interval = probe_interval
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        # Latency is scored per (operation, url), so a cheap call is never
+        # compared against a heavy list call on another endpoint
+        self._latency: Dict[Tuple[Optional[str], str], float] = {}
+        self._measured_at: Dict[Tuple[Optional[str], str], float] = {}
+        self._down_until: Dict[str, float] = {url: 0.0 for url in self.urls}
+        self._samples: Dict[str, deque] = {}
+        self._hedge_tokens = 0.0
+        self._hedges_in_flight = 0
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+
+    def ranked(self, operation: Optional[str] = None) -> List[str]:
+        """
+        Get endpoints ordered best first
+
+        Healthy endpoints come before ones in their failure cooldown and are
+        ordered by smoothed latency of the operation. Endpoints without
+        measurements yet sort first so that every endpoint gets scored.
+
+        Args:
+            operation: Operation name whose latency decides the order
+
+        Returns:
+            List of endpoint URLs
+        """
+        now = time.monotonic()
+        with self._lock:
+            return sorted(self.urls, key=lambda url: (
+                self._down_until[url] > now,
+                self._latency.get((operation, url), 0.0),
+                self.urls.index(url)
+            ))
+
+    def record(
+        self,
+        url: str,
+        elapsed: float,
+        ok: bool,
+        operation: Optional[str] = None,
+        probe: bool = False
+    ):
+        """
+        Record the outcome of a request
+
+        Args:
+            url: Endpoint URL
+            elapsed: Request duration in seconds
+            ok: Whether the endpoint answered successfully
+            operation: Operation name the latency is scored under
+            probe: Whether this was a probe, which does not feed the hedge delay
+        """
+        key = (operation, url)
+        with self._lock:
+            self._measured_at[key] = time.monotonic()
+            if not ok:
+                self._down_until[url] = time.monotonic() + self.failure_cooldown
+                return
+            previous = self._latency.get(key)
+            self._latency[key] = elapsed if previous is None else 0.8 * previous + 0.2 * elapsed
+            self._down_until[url] = 0.0
+            if operation and not probe:
+                self._samples.setdefault(operation, deque(maxlen=500)).append(elapsed)
+
+    def hedge_delay(self, operation: str) -> Optional[float]:
+        """
+        Get how long to wait before hedging an operation
+
+        Args:
+            operation: Operation name, e.g. get_balance
+
+        Returns:
+            Delay in seconds, or None if there are too few samples yet
+        """
+        with self._lock:
+            samples = self._samples.get(operation)
+            if not samples or len(samples) < _MIN_SAMPLES:
+                return None
+            samples = sorted(samples)
+        index = min(int(len(samples) * self.hedge_percentile / 100), len(samples) - 1)
+        return samples[index]
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        idempotent: Optional[bool] = None,
+        hedge: bool = False,
+        operation: Optional[str] = None,
+        **kwargs: Any
+    ) -> requests.Response:
+        """
+        Send a request to the best endpoint
+
+        Idempotent requests fail over to the next endpoint on network errors
+        and 502/503/504 responses. Hedged requests are also sent to a second
+        endpoint when the first has not answered within the hedge delay,
+        as long as the hedge budget allows it. The hedge delay is a latency
+        percentile of earlier calls of the same operation.
+
+        Named GET requests also re-measure endpoints that have not served the
+        operation for probe_interval seconds by sending them a copy of the
+        request in the background. Probes are paid from the hedge budget.
+
+        Args:
+            method: HTTP method
+            path: Path relative to the endpoint base URL
+            idempotent: Whether the request may be retried (defaults to GET only)
+            hedge: Whether to hedge the request (requires operation)
+            operation: Operation name used to track latency for hedging
+            **kwargs: Arguments passed to requests.request
+
+        Returns:
+            requests.Response from the first endpoint that answered
+        """
+        if idempotent is None:
+            idempotent = method.upper() == 'GET'
+        kwargs.setdefault('timeout', self.timeout)
+
+        urls = self.ranked(operation)
+        with self._lock:
+            self._hedge_tokens = min(self._hedge_tokens + self.hedge_budget, _HEDGE_BURST)
+
+        if operation and method.upper() == 'GET' and not kwargs.get('stream'):
+            self._probe(method, path, urls[1:], kwargs, operation)
+
+        if hedge and operation and idempotent and len(urls) > 1:
+            delay = self.hedge_delay(operation)
+            if delay is not None:
+                return self._hedged(method, path, urls, delay, kwargs, operation)
+
+        return self._failover(method, path, urls if idempotent else urls[:1], kwargs, operation)
+
+    def _send(
+        self,
+        url: str,
+        method: str,
+        path: str,
+        kwargs: Dict[str, Any],
+        operation: Optional[str] = None,
+        probe: bool = False
+    ) -> requests.Response:
+        """Send a request to one endpoint and score it"""
+        start = time.monotonic()
+        try:
+            response = requests.request(method, f"{url}{path}", **kwargs)
+        except requests.RequestException:
+            self.record(url, time.monotonic() - start, False, operation, probe)
+            raise
+        ok = response.status_code not in RETRYABLE_STATUS_CODES
+        self.record(url, time.monotonic() - start, ok, operation, probe)
+        return response
+
+    def _probe(
+        self,
+        method: str,
+        path: str,
+        urls: List[str],
+        kwargs: Dict[str, Any],
+        operation: str
+    ):
+        """Re-measure endpoints that have not served an operation for probe_interval seconds"""
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            for url in urls:
+                key = (operation, url)
+                if now - self._measured_at.get(key, 0.0) < self.probe_interval:
+                    continue
+                if self._hedge_tokens < 1.0:
+                    break
+                # Claim the probe so concurrent requests do not send another
+                self._measured_at[key] = now
+                self._hedge_tokens -= 1.0
+                stale.append(url)
+
+        for url in stale:
+            self._get_executor('probe').submit(self._probe_one, url, method, path, dict(kwargs), operation)
+
+    def _probe_one(self, url: str, method: str, path: str, kwargs: Dict[str, Any], operation: str):
+        """Send a probe request; its outcome only updates the endpoint score"""
+        try:
+            self._send(url, method, path, kwargs, operation, True).close()
+        except requests.RequestException:
+            pass
+
+    def _failover(
+        self,
+        method: str,
+        path: str,
+        urls: List[str],
+        kwargs: Dict[str, Any],
+        operation: Optional[str] = None
+    ) -> requests.Response:
+        """Try endpoints in order until one answers"""
+        for position, url in enumerate(urls):
+            last = position == len(urls) - 1
+            try:
+                response = self._send(url, method, path, kwargs, operation)
+            except requests.RequestException:
+                if last:
+                    raise
+                continue
+            if response.status_code in RETRYABLE_STATUS_CODES and not last:
+                continue
+            return response
+
+    def _hedged(
+        self,
+        method: str,
+        path: str,
+        urls: List[str],
+        delay: float,
+        kwargs: Dict[str, Any],
+        operation: str
+    ) -> requests.Response:
+        """Send to the best endpoint and hedge to the next one if it is slow"""
+        # The primary gets its own thread rather than a pool slot, so it never
+        # queues and queueing time never counts toward the hedge delay
+        primary: Future = Future()
+        threading.Thread(
+            target=self._run,
+            args=(primary, urls[0], method, path, kwargs, operation),
+            name='wekeza-primary',
+            daemon=True
+        ).start()
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._take_hedge_token():
+            return self._resolve(primary, method, path, urls[1:], kwargs, operation)
+
+        hedge = self._get_executor('hedge').submit(self._hedge, urls[1], method, path, kwargs, operation)
+        last_response = None
+        last_error = None
+        for future in as_completed([primary, hedge]):
+            try:
+                response = future.result()
+            except requests.RequestException as e:
+                last_error = e
+                continue
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                return response
+            last_response = response
+
+        if last_response is not None:
+            return last_response
+        raise last_error
+
+    def _run(self, future: Future, *args: Any):
+        """Send a request and store its outcome in future"""
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(self._send(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _hedge(self, *args: Any) -> requests.Response:
+        """Send a hedge request, releasing its pool slot afterwards"""
+        try:
+            return self._send(*args)
+        finally:
+            with self._lock:
+                self._hedges_in_flight -= 1
+
+    def _resolve(
+        self,
+        future: Future,
+        method: str,
+        path: str,
+        rest: List[str],
+        kwargs: Dict[str, Any],
+        operation: str
+    ) -> requests.Response:
+        """Wait for a request and fail over to the remaining endpoints if it failed"""
+        try:
+            response = future.result()
+        except requests.RequestException:
+            if not rest:
+                raise
+            return self._failover(method, path, rest, kwargs, operation)
+        if response.status_code in RETRYABLE_STATUS_CODES and rest:
+            return self._failover(method, path, rest, kwargs, operation)
+        return response
+
+    def _take_hedge_token(self) -> bool:
+        """Spend one hedge token if the budget and a free hedge thread allow"""
+        with self._lock:
+            # A hedge that would queue for a thread arrives too late to help
+            if self._hedge_tokens < 1.0 or self._hedges_in_flight >= _HEDGE_WORKERS:
+                return False
+            self._hedge_tokens -= 1.0
+            self._hedges_in_flight += 1
+            return True
+
+    def _get_executor(self, kind: str) -> ThreadPoolExecutor:
+        """Get the thread pool used for hedge or probe requests"""
+        with self._lock:
+            if kind not in self._executors:
+                workers = _HEDGE_WORKERS if kind == 'hedge' else _PROBE_WORKERS
+                self._executors[kind] = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix=f'wekeza-{kind}'
+                )
+            return self._executors[kind]
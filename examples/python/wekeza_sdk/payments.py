@@ -6,22 +6,38 @@ Handles payment initiation and tracking
 import requests
 import secrets
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from .compression import ACCEPT_ENCODING, compress_json
+from .endpoints import DEFAULT_TIMEOUT, WekezaEndpoints
+from .streaming import STREAM_CHUNK_SIZE, iter_json_items, iter_pages
+
+# Largest number of payments the API accepts in one bulk request by default;
+# servers configured with a lower BATCH_MAX_SIZE need max_batch_size set
+MAX_BATCH_SIZE = 1000
 
 
 class WekezaPayments:
     """Handles payment-related API calls"""
     
-    def __init__(self, config: Dict[str, str], auth):
+    def __init__(self, config: Dict[str, Any], auth, endpoints: Optional[WekezaEndpoints] = None):
         self.base_url = config['base_url']
         self.auth = auth
+        self.endpoints = endpoints or WekezaEndpoints(
+            config.get('base_urls') or [self.base_url],
+            hedge_budget=config.get('hedge_budget', 0.05),
+            timeout=config.get('timeout', DEFAULT_TIMEOUT)
+        )
+        self.hedge = bool(config.get('hedge_requests'))
+        self.max_batch_size = int(config.get('max_batch_size') or MAX_BATCH_SIZE)
     
     def _get_headers(self, additional_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         """Get authenticated headers"""
         token = self.auth.get_access_token()
         headers = {
             'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'Accept-Encoding': ACCEPT_ENCODING
         }
         if additional_headers:
             headers.update(additional_headers)
@@ -47,16 +63,68 @@ class WekezaPayments:
             if not idempotency_key:
                 idempotency_key = self.generate_idempotency_key()
             
-            response = requests.post(
-                f"{self.base_url}/payments",
-                json=payment_data,
-                headers=self._get_headers({'Idempotency-Key': idempotency_key})
+            body, encoding_headers = compress_json(payment_data)
+            response = self.endpoints.request(
+                'POST',
+                "/payments",
+                idempotent=True,
+                data=body,
+                headers=self._get_headers({'Idempotency-Key': idempotency_key, **encoding_headers})
             )
             response.raise_for_status()
             return response.json()
         except Exception as e:
             raise self._handle_error(e)
     
+    def initiate_payments(self, payments: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Initiate multiple payments with bulk requests
+        
+        Each payment without an idempotencyKey gets one written into its dict
+        before anything is sent, so calling this again with the same list
+        after a failure never pays twice. Large inputs are split into chunks
+        of chunk_size payments. If a chunk fails, the raised exception has a
+        partial_result attribute holding the results of the chunks before it.
+        
+        Args:
+            payments: Payment details, each optionally with idempotencyKey
+            chunk_size: Number of payments sent per request (default: max_batch_size)
+            
+        Returns:
+            Dict with per-payment results in input order and a summary of counts
+        """
+        chunk_size = chunk_size or self.max_batch_size
+        if not 1 <= chunk_size <= self.max_batch_size:
+            raise ValueError(f"chunk_size must be between 1 and {self.max_batch_size}")
+        
+        for payment in payments:
+            if not payment.get('idempotencyKey'):
+                payment['idempotencyKey'] = self.generate_idempotency_key()
+        
+        merged = {'results': [], 'summary': {'created': 0, 'duplicate': 0, 'failed': 0}}
+        
+        try:
+            for start in range(0, len(payments), chunk_size):
+                body, encoding_headers = compress_json({'payments': payments[start:start + chunk_size]})
+                response = self.endpoints.request(
+                    'POST',
+                    "/payments/bulk",
+                    idempotent=True,
+                    data=body,
+                    headers=self._get_headers(encoding_headers)
+                )
+                response.raise_for_status()
+                page = response.json()
+                for result in page.get('results', []):
+                    merged['results'].append({**result, 'index': start + result['index']})
+                for status, count in page.get('summary', {}).items():
+                    merged['summary'][status] = merged['summary'].get(status, 0) + count
+        except Exception as e:
+            error = self._handle_error(e)
+            error.partial_result = merged
+            raise error
+        return merged
+    
     def get_payment(self, payment_id: str) -> Dict[str, Any]:
         """
         Get payment details
@@ -68,8 +136,9 @@ class WekezaPayments:
             Dict containing payment details
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/payments/{payment_id}",
+            response = self.endpoints.request(
+                'GET',
+                f"/payments/{payment_id}",
                 headers=self._get_headers()
             )
             response.raise_for_status()
@@ -88,8 +157,11 @@ class WekezaPayments:
             Dict containing payment status
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/payments/{payment_id}/status",
+            response = self.endpoints.request(
+                'GET',
+                f"/payments/{payment_id}/status",
+                hedge=self.hedge,
+                operation='get_payment_status',
                 headers=self._get_headers()
             )
             response.raise_for_status()
@@ -97,27 +169,61 @@ class WekezaPayments:
         except Exception as e:
             raise self._handle_error(e)
     
-    def list_payments(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def list_payments(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         List payments
         
         Args:
             params: Query parameters (status, fromDate, toDate, page, limit)
+            fields: Payment fields to return (default: all)
             
         Returns:
             Dict containing payment list
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/payments",
+            response = self.endpoints.request(
+                'GET',
+                "/payments",
                 headers=self._get_headers(),
-                params=params or {}
+                params=self._build_params(params, fields)
             )
             response.raise_for_status()
             return response.json()
         except Exception as e:
             raise self._handle_error(e)
     
+    def iter_payments(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream payments across all pages
+        
+        Each payment is yielded as soon as it is parsed from the response
+        body, and the next page is requested when the current one runs out.
+        
+        Args:
+            params: Query parameters (sourceAccountId, status)
+            page_size: Number of payments requested per page
+            fields: Payment fields to return (default: all)
+            
+        Returns:
+            Iterator over payments
+        """
+        def fetch_page(cursor: Optional[str], limit: int) -> Tuple[Iterator[Dict[str, Any]], Optional[str]]:
+            page_params = {**self._build_params(params, fields), 'limit': limit}
+            if cursor:
+                page_params['cursor'] = cursor
+            return self._stream("/payments", page_params)
+        
+        return iter_pages(fetch_page, page_size)
+    
     def cancel_payment(self, payment_id: str, reason: str) -> Dict[str, Any]:
         """
         Cancel a payment
@@ -130,8 +236,9 @@ class WekezaPayments:
             Dict containing cancellation response
         """
         try:
-            response = requests.post(
-                f"{self.base_url}/payments/{payment_id}/cancel",
+            response = self.endpoints.request(
+                'POST',
+                f"/payments/{payment_id}/cancel",
                 json={'reason': reason},
                 headers=self._get_headers()
             )
@@ -151,8 +258,9 @@ class WekezaPayments:
             Dict containing M-Pesa response
         """
         try:
-            response = requests.post(
-                f"{self.base_url}/payments/mpesa/stk-push",
+            response = self.endpoints.request(
+                'POST',
+                "/payments/mpesa/stk-push",
                 json=mpesa_data,
                 headers=self._get_headers()
             )
@@ -161,6 +269,38 @@ class WekezaPayments:
         except Exception as e:
             raise self._handle_error(e)
     
+    @staticmethod
+    def _build_params(params: Optional[Dict[str, Any]], fields: Optional[List[str]]) -> Dict[str, Any]:
+        """Merge query parameters with a sparse fieldset"""
+        query = dict(params or {})
+        if fields:
+            query['fields'] = ','.join(fields)
+        return query
+    
+    def _stream(self, path: str, params: Dict[str, Any]) -> Tuple[Iterator[Dict[str, Any]], Optional[str]]:
+        """Request a list page, returning its streamed data array and next cursor"""
+        try:
+            response = self.endpoints.request(
+                'GET',
+                path,
+                headers=self._get_headers(),
+                params=params,
+                stream=True
+            )
+            response.raise_for_status()
+        except Exception as e:
+            raise self._handle_error(e)
+        return self._iter_data(response), response.headers.get('X-Next-Cursor')
+    
+    def _iter_data(self, response: requests.Response) -> Iterator[Dict[str, Any]]:
+        """Yield the data array of a streamed list response"""
+        try:
+            yield from iter_json_items(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+        except Exception as e:
+            raise self._handle_error(e)
+        finally:
+            response.close()
+    
     def _handle_error(self, error: Exception) -> Exception:
         """Handle API errors"""
         if isinstance(error, requests.HTTPError):
@@ -0,0 +1,537 @@
+"""
+Wekeza API Reconciliation Module
+Matches a local ledger against payments and transactions using columnar arrays
+"""
+
+import numpy as np
+from typing import Dict, Any, Optional, Iterable, Iterator, List, Tuple
+
+
+# Field names used by the API for each side of a reconciliation
+PAYMENT_FIELDS = {
+    'reference': 'reference',
+    'idempotency_key': 'idempotencyKey',
+    'amount': 'amount',
+    'date': 'createdAt'
+}
+
+TRANSACTION_FIELDS = {
+    'reference': 'transactionRef',
+    'idempotency_key': None,
+    'amount': 'amount',
+    'date': 'transactionDate'
+}
+
+LEDGER_FIELDS = {
+    'reference': 'reference',
+    'idempotency_key': 'idempotency_key',
+    'amount': 'amount',
+    'date': 'date'
+}
+
+# Hash value used for records without a reference or idempotency key
+_NO_KEY = 0
+
+# Bit widths used to pack (amount, day) into one int64 key: days since the
+# epoch must fit in _DAY_BITS and amounts (minor units) in +/-2**_AMOUNT_BITS
+_DAY_BITS = 20
+_AMOUNT_BITS = 41
+
+
+def _hash_key(value: Any) -> int:
+    """Hash a reference or idempotency key to an int64"""
+    if value is None or value == '':
+        return _NO_KEY
+    return hash(str(value)) or 1
+
+
+def _to_minor_units(value: Any) -> int:
+    """Convert an amount to integer minor units (cents)"""
+    return int(round(float(value or 0) * 100))
+
+
+def _requested_fields(fields: Dict[str, Optional[str]]) -> List[str]:
+    """Get the API fields a reconciliation needs, for a sparse fieldset"""
+    return [field for field in fields.values() if field]
+
+
+def _to_day(value: Any) -> int:
+    """Convert an ISO date or timestamp to days since the epoch"""
+    if not value:
+        return 0
+    return int(np.datetime64(str(value)[:10], 'D').astype(np.int64))
+
+
+def _bucket_key(amount: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """Pack (amount, day) into one int64 for exact-match joins"""
+    return amount * (1 << _DAY_BITS) + day
+
+
+def _window_key(amount: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """Pack (day, amount) into one int64 ordered by day, then amount"""
+    return day * (1 << (_AMOUNT_BITS + 1)) + amount + (1 << _AMOUNT_BITS)
+
+
+def _rank_within_key(keys: np.ndarray) -> np.ndarray:
+    """Position of each element among the elements sharing its key"""
+    count = len(keys)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    starts = np.ones(count, dtype=bool)
+    starts[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    positions = np.arange(count, dtype=np.int64)
+    group_start = np.maximum.accumulate(np.where(starts, positions, 0))
+    rank = np.empty(count, dtype=np.int64)
+    rank[order] = positions - group_start
+    return rank
+
+
+def _bucket_join(left_keys: np.ndarray, right_keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pair the k-th left element of each key with the k-th right element of that key"""
+    empty = np.array([], dtype=np.int64)
+    if not len(left_keys) or not len(right_keys):
+        return empty, empty
+
+    _, dense = np.unique(np.concatenate([left_keys, right_keys]), return_inverse=True)
+    dense = dense.reshape(-1).astype(np.int64)
+    width = max(len(left_keys), len(right_keys))
+    left_composite = dense[:len(left_keys)] * width + _rank_within_key(left_keys)
+    right_composite = dense[len(left_keys):] * width + _rank_within_key(right_keys)
+
+    order = np.argsort(right_composite)
+    sorted_right = right_composite[order]
+    positions = np.minimum(np.searchsorted(sorted_right, left_composite), len(order) - 1)
+    hit = sorted_right[positions] == left_composite
+    return np.flatnonzero(hit), order[positions[hit]]
+
+
+class _FreeList:
+    """Finds the nearest unused slot to the left or right of a position"""
+
+    def __init__(self, size: int):
+        self._right = list(range(size + 1))
+        self._left = list(range(size + 1))
+
+    @staticmethod
+    def _find(parent: List[int], index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def right(self, index: int) -> int:
+        """Nearest unused slot at or after index (size if none)"""
+        return self._find(self._right, index)
+
+    def left(self, index: int) -> int:
+        """Nearest unused slot at or before index (-1 if none)"""
+        return self._find(self._left, index + 1) - 1
+
+    def take(self, index: int):
+        """Mark a slot as used"""
+        self._right[index] = index + 1
+        self._left[index + 1] = index
+
+
+class _Frame:
+    """Columnar view of a batch of records"""
+
+    def __init__(self, records: List[Dict[str, Any]], fields: Dict[str, Optional[str]]):
+        self.records = records
+        self.fields = fields
+        count = len(records)
+
+        def column(field, convert):
+            if not field:
+                return np.zeros(count, dtype=np.int64)
+            return np.fromiter(
+                (convert(record.get(field)) for record in records),
+                dtype=np.int64,
+                count=count
+            )
+
+        self.reference = column(fields.get('reference'), _hash_key)
+        self.idempotency_key = column(fields.get('idempotency_key'), _hash_key)
+        self.amount = column(fields.get('amount'), _to_minor_units)
+        self.date = column(fields.get('date'), _to_day)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def value(self, index: int, name: str) -> Any:
+        """Get the raw value of a mapped field"""
+        field = self.fields.get(name)
+        return self.records[index].get(field) if field else None
+
+
+class WekezaReconciliation:
+    """
+    Reconciles a local ledger against payments and transactions.
+
+    Both sides are loaded into NumPy arrays. Records are first hash-joined on
+    idempotency key and then on reference; whatever is left is matched on
+    amount and date within the configured tolerances using sorted-index
+    searches. Large reconciliations are processed one date partition at a
+    time so memory stays bounded by the size of a partition.
+    """
+
+    def __init__(
+        self,
+        accounts=None,
+        payments=None,
+        amount_tolerance: float = 0.0,
+        date_tolerance_days: int = 0,
+        ledger_fields: Optional[Dict[str, Optional[str]]] = None
+    ):
+        """
+        Initialize reconciliation
+
+        Args:
+            accounts: WekezaAccounts used to fetch transactions
+            payments: WekezaPayments used to fetch payments
+            amount_tolerance: Maximum amount difference for a match
+            date_tolerance_days: Maximum date difference for a match, in days
+            ledger_fields: Mapping of reference, idempotency_key, amount and
+                date to the field names used by the ledger records
+        """
+        self.accounts = accounts
+        self.payments = payments
+        self.amount_tolerance = _to_minor_units(amount_tolerance)
+        self.date_tolerance_days = int(date_tolerance_days)
+        self.ledger_fields = {**LEDGER_FIELDS, **(ledger_fields or {})}
+
+    def reconcile(
+        self,
+        ledger: Iterable[Dict[str, Any]],
+        remote: Iterable[Dict[str, Any]],
+        remote_fields: Optional[Dict[str, Optional[str]]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Reconcile ledger records against API records held in memory
+
+        Args:
+            ledger: Local ledger records
+            remote: Payments or transactions returned by the API
+            remote_fields: Field mapping for the API records (defaults to payments)
+
+        Returns:
+            Dict with matched, mismatched, missing_in_remote and missing_in_ledger lists
+        """
+        result, _, _ = self._reconcile_batch(
+            list(ledger), list(remote), remote_fields or PAYMENT_FIELDS, final=True
+        )
+        return result
+
+    def reconcile_partitions(
+        self,
+        partitions: Iterable[Tuple[Iterable[Dict[str, Any]], Iterable[Dict[str, Any]]]],
+        remote_fields: Optional[Dict[str, Optional[str]]] = None
+    ) -> Iterator[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Reconcile date partitions one at a time
+
+        Partitions must be in ascending date order. Unmatched records close
+        enough to the end of a partition to match within the date tolerance
+        are carried into the next partition before being reported missing.
+
+        Args:
+            partitions: Iterable of (ledger records, API records) per date
+            remote_fields: Field mapping for the API records (defaults to payments)
+
+        Yields:
+            Dict with matched, mismatched, missing_in_remote and missing_in_ledger lists
+        """
+        remote_fields = remote_fields or PAYMENT_FIELDS
+        carry_ledger: List[Dict[str, Any]] = []
+        carry_remote: List[Dict[str, Any]] = []
+
+        for ledger, remote in partitions:
+            result, carry_ledger, carry_remote = self._reconcile_batch(
+                carry_ledger + list(ledger),
+                carry_remote + list(remote),
+                remote_fields,
+                final=False
+            )
+            yield result
+
+        if carry_ledger or carry_remote:
+            yield self._empty_result(carry_ledger, carry_remote)
+
+    def reconcile_payments(
+        self,
+        ledger_by_date: Iterable[Tuple[str, Iterable[Dict[str, Any]]]],
+        params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Reconcile the ledger against payments, fetched one day at a time
+
+        Args:
+            ledger_by_date: Iterable of (YYYY-MM-DD, ledger records) in date order
+            params: Extra query parameters for iter_payments
+
+        Yields:
+            Reconciliation result for each date
+        """
+        def partitions():
+            for day, ledger in ledger_by_date:
+                yield ledger, self.payments.iter_payments(
+                    {**(params or {}), 'fromDate': day, 'toDate': day},
+                    fields=_requested_fields(PAYMENT_FIELDS)
+                )
+
+        return self.reconcile_partitions(partitions(), PAYMENT_FIELDS)
+
+    def reconcile_transactions(
+        self,
+        account_id: str,
+        ledger_by_date: Iterable[Tuple[str, Iterable[Dict[str, Any]]]],
+        params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Reconcile the ledger against account transactions, fetched one day at a time
+
+        Args:
+            account_id: Account ID
+            ledger_by_date: Iterable of (YYYY-MM-DD, ledger records) in date order
+            params: Extra query parameters for iter_transactions
+
+        Yields:
+            Reconciliation result for each date
+        """
+        def partitions():
+            for day, ledger in ledger_by_date:
+                yield ledger, self.accounts.iter_transactions(
+                    account_id,
+                    {**(params or {}), 'fromDate': day, 'toDate': day},
+                    fields=_requested_fields(TRANSACTION_FIELDS)
+                )
+
+        return self.reconcile_partitions(partitions(), TRANSACTION_FIELDS)
+
+    def _reconcile_batch(
+        self,
+        ledger_records: List[Dict[str, Any]],
+        remote_records: List[Dict[str, Any]],
+        remote_fields: Dict[str, Optional[str]],
+        final: bool
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Match one batch and split unmatched records into missing and carried"""
+        ledger = _Frame(ledger_records, self.ledger_fields)
+        remote = _Frame(remote_records, remote_fields)
+        ledger_open = np.ones(len(ledger), dtype=bool)
+        remote_open = np.ones(len(remote), dtype=bool)
+        result = self._empty_result([], [])
+
+        for name in ('idempotency_key', 'reference'):
+            left, right = self._hash_join(ledger, remote, name, ledger_open, remote_open)
+            ledger_open[left] = False
+            remote_open[right] = False
+            self._classify(ledger, remote, left, right, name, result)
+
+        left, right = self._tolerance_join(ledger, remote, ledger_open, remote_open)
+        ledger_open[left] = False
+        remote_open[right] = False
+        for i, j in zip(left.tolist(), right.tolist()):
+            result['matched'].append({
+                'ledger': ledger.records[i],
+                'remote': remote.records[j],
+                'match_type': 'tolerance'
+            })
+
+        ledger_carry = np.zeros(len(ledger), dtype=bool)
+        remote_carry = np.zeros(len(remote), dtype=bool)
+        if not final and self.date_tolerance_days > 0 and (len(ledger) or len(remote)):
+            horizon = max(
+                ledger.date.max() if len(ledger) else remote.date.max(),
+                remote.date.max() if len(remote) else ledger.date.max()
+            ) - self.date_tolerance_days
+            ledger_carry = ledger_open & (ledger.date >= horizon)
+            remote_carry = remote_open & (remote.date >= horizon)
+
+        result['missing_in_remote'] = [ledger.records[i] for i in np.flatnonzero(ledger_open & ~ledger_carry)]
+        result['missing_in_ledger'] = [remote.records[i] for i in np.flatnonzero(remote_open & ~remote_carry)]
+        carried_ledger = [ledger.records[i] for i in np.flatnonzero(ledger_carry)]
+        carried_remote = [remote.records[i] for i in np.flatnonzero(remote_carry)]
+        return result, carried_ledger, carried_remote
+
+    @staticmethod
+    def _hash_join(
+        ledger: _Frame,
+        remote: _Frame,
+        name: str,
+        ledger_open: np.ndarray,
+        remote_open: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Join open records on a hashed key, pairing each key at most once"""
+        empty = np.array([], dtype=np.int64)
+        left_keys = getattr(ledger, name)
+        right_keys = getattr(remote, name)
+        left = np.flatnonzero(ledger_open & (left_keys != _NO_KEY))
+        right = np.flatnonzero(remote_open & (right_keys != _NO_KEY))
+        if not len(left) or not len(right):
+            return empty, empty
+
+        # The first occurrence of each key on the API side is the join target
+        order = right[np.argsort(right_keys[right], kind='stable')]
+        unique_keys, first = np.unique(right_keys[order], return_index=True)
+        positions = np.minimum(np.searchsorted(unique_keys, left_keys[left]), len(unique_keys) - 1)
+        hit = unique_keys[positions] == left_keys[left]
+        left = left[hit]
+        right = order[first[positions[hit]]]
+
+        # Duplicate ledger keys pair only once; the rest stay open
+        right, keep = np.unique(right, return_index=True)
+        left = left[keep]
+
+        # Guard against hash collisions by comparing the raw values
+        same = np.fromiter(
+            (str(ledger.value(i, name)) == str(remote.value(j, name))
+             for i, j in zip(left.tolist(), right.tolist())),
+            dtype=bool,
+            count=len(left)
+        )
+        return left[same], right[same]
+
+    def _tolerance_join(
+        self,
+        ledger: _Frame,
+        remote: _Frame,
+        ledger_open: np.ndarray,
+        remote_open: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pair open records whose amount and date fall within the tolerances
+
+        Exact amounts are paired first, one date offset at a time starting
+        with the same day, as a vectorized join on (amount, day) buckets.
+        Only records left over after that are searched within the amount
+        tolerance, and each search only covers its own day.
+        """
+        ledger_open = ledger_open.copy()
+        remote_open = remote_open.copy()
+        pairs_left = []
+        pairs_right = []
+
+        for offset in self._date_offsets():
+            left = np.flatnonzero(ledger_open)
+            right = np.flatnonzero(remote_open)
+            if not len(left) or not len(right):
+                break
+            hit_left, hit_right = _bucket_join(
+                _bucket_key(ledger.amount[left], ledger.date[left] + offset),
+                _bucket_key(remote.amount[right], remote.date[right])
+            )
+            ledger_open[left[hit_left]] = False
+            remote_open[right[hit_right]] = False
+            pairs_left.append(left[hit_left])
+            pairs_right.append(right[hit_right])
+
+        if self.amount_tolerance:
+            left, right = self._window_join(ledger, remote, ledger_open, remote_open)
+            pairs_left.append(left)
+            pairs_right.append(right)
+
+        if not pairs_left:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        return np.concatenate(pairs_left), np.concatenate(pairs_right)
+
+    def _window_join(
+        self,
+        ledger: _Frame,
+        remote: _Frame,
+        ledger_open: np.ndarray,
+        remote_open: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Pair leftover records whose amounts differ by at most the amount tolerance"""
+        empty = np.array([], dtype=np.int64)
+        left = np.flatnonzero(ledger_open)
+        right = np.flatnonzero(remote_open)
+        if not len(left) or not len(right):
+            return empty, empty
+
+        # Sorted by day, then amount, so each probe is one contiguous window
+        keys = _window_key(remote.amount[right], remote.date[right])
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        right = right[order]
+        amounts = remote.amount[right]
+
+        # Union-find pointers to the nearest unused record on each side, so
+        # records already paired are skipped without rescanning the window
+        next_free = _FreeList(len(right))
+        done = np.zeros(len(left), dtype=bool)
+        pairs_left: List[int] = []
+        pairs_right: List[int] = []
+
+        for offset in self._date_offsets():
+            pending = np.flatnonzero(~done)
+            days = ledger.date[left[pending]] + offset
+            amount = ledger.amount[left[pending]]
+            low = np.searchsorted(keys, _window_key(amount - self.amount_tolerance, days), side='left')
+            high = np.searchsorted(keys, _window_key(amount + self.amount_tolerance, days), side='right')
+            pivot = np.searchsorted(keys, _window_key(amount, days), side='left')
+            candidates = high > low
+
+            for position, target, start, stop, middle in zip(
+                pending[candidates].tolist(),
+                amount[candidates].tolist(),
+                low[candidates].tolist(),
+                high[candidates].tolist(),
+                pivot[candidates].tolist()
+            ):
+                # Prefer the closest amount on either side of the pivot
+                above = next_free.right(middle)
+                below = next_free.left(middle - 1)
+                options = [index for index in (above, below) if start <= index < stop]
+                if not options:
+                    continue
+                best = min(options, key=lambda index: abs(int(amounts[index]) - target))
+                next_free.take(best)
+                done[position] = True
+                pairs_left.append(int(left[position]))
+                pairs_right.append(int(right[best]))
+
+        return np.array(pairs_left, dtype=np.int64), np.array(pairs_right, dtype=np.int64)
+
+    def _date_offsets(self) -> List[int]:
+        """Day offsets to try, closest first: 0, 1, -1, 2, -2, ..."""
+        offsets = [0]
+        for days in range(1, self.date_tolerance_days + 1):
+            offsets.extend((days, -days))
+        return offsets
+
+    def _classify(
+        self,
+        ledger: _Frame,
+        remote: _Frame,
+        left: np.ndarray,
+        right: np.ndarray,
+        match_type: str,
+        result: Dict[str, List[Dict[str, Any]]]
+    ):
+        """Split key-joined pairs into matched and mismatched"""
+        amount_off = np.abs(ledger.amount[left] - remote.amount[right]) > self.amount_tolerance
+        date_off = np.abs(ledger.date[left] - remote.date[right]) > self.date_tolerance_days
+
+        for i, j, bad_amount, bad_date in zip(left.tolist(), right.tolist(), amount_off.tolist(), date_off.tolist()):
+            pair = {'ledger': ledger.records[i], 'remote': remote.records[j], 'match_type': match_type}
+            if bad_amount or bad_date:
+                pair['differences'] = [
+                    field for field, off in (('amount', bad_amount), ('date', bad_date)) if off
+                ]
+                result['mismatched'].append(pair)
+            else:
+                result['matched'].append(pair)
+
+    @staticmethod
+    def _empty_result(
+        missing_in_remote: List[Dict[str, Any]],
+        missing_in_ledger: List[Dict[str, Any]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Build a result with only missing records"""
+        return {
+            'matched': [],
+            'mismatched': [],
+            'missing_in_remote': missing_in_remote,
+            'missing_in_ledger': missing_in_ledger
+        }
@@ -0,0 +1,152 @@
+"""
+Wekeza API Streaming Module
+Incremental parsing of large list responses
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+# Bytes read from the response body at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# Characters that can continue a JSON number
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+
+
+class _JsonStream:
+    """Reads JSON tokens from a stream of byte chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        """Append the next chunk to the buffer, dropping consumed text"""
+        text = ''
+        for chunk in self._chunks:
+            text = self._text.decode(chunk)
+            if text:
+                break
+        else:
+            text = self._text.decode(b'', final=True)
+            self._eof = True
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+
+    def peek(self) -> str:
+        """Get the next non-whitespace character without consuming it"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                raise ValueError("Unexpected end of JSON stream")
+            self._fill()
+
+    def expect(self, char: str):
+        """Consume the next non-whitespace character, which must be char"""
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in JSON stream")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                # A number running up to the buffer end may continue in the next chunk
+                if self._eof or not self._number_at_end(value, end):
+                    self._pos = end
+                    return value
+            self._fill()
+
+    def _number_at_end(self, value: Any, end: int) -> bool:
+        """Check whether a decoded number may be cut off by the buffer end"""
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        return _NUMBER_TAIL.match(self._buffer, end).end() == len(self._buffer)
+
+
+def iter_json_items(chunks: Iterable[bytes], key: str = 'data') -> Iterator[Any]:
+    """
+    Yield the elements of a top-level array as they are parsed
+
+    Only the current element and the unread part of the current chunk are
+    held in memory, so peak memory is proportional to one record rather
+    than the whole response.
+
+    Args:
+        chunks: Response body as byte chunks
+        key: Name of the top-level array to stream
+
+    Yields:
+        Each element of the array
+    """
+    stream = _JsonStream(chunks)
+    stream.expect('{')
+    while True:
+        char = stream.peek()
+        if char == '}':
+            return
+        if char == ',':
+            stream.expect(',')
+            continue
+
+        name = stream.value()
+        stream.expect(':')
+        if name != key or stream.peek() != '[':
+            stream.value()
+            continue
+
+        stream.expect('[')
+        while True:
+            char = stream.peek()
+            if char == ']':
+                stream.expect(']')
+                break
+            if char == ',':
+                stream.expect(',')
+                continue
+            yield stream.value()
+
+
+def iter_pages(
+    fetch_page: Callable[[Optional[str], int], Tuple[Iterable[Any], Optional[str]]],
+    page_size: int
+) -> Iterator[Any]:
+    """
+    Chain cursor-paginated pages into one stream
+
+    Each page starts right after the last item of the previous one, so
+    items added while streaming are neither repeated nor skipped.
+
+    Args:
+        fetch_page: Function taking (cursor, limit) and returning that page's
+            items and the cursor of the next page (None on the last page)
+        page_size: Number of items requested per page
+
+    Yields:
+        Each item of every page
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+
+    cursor = None
+    while True:
+        items, cursor = fetch_page(cursor, page_size)
+        yield from items
+        if not cursor:
+            return